@@ -1,4 +1,22 @@
+import functools
 import itertools
+import mmap
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+NEWLINE = ord('\n')
+CARRIAGE_RETURN = ord('\r')
+ZERO = ord('0')
+LEFT = ord('L')
+RIGHT = ord('R')
+CHUNK_SIZE = 1 << 24
 
 
 def move_dial(dial_at, move):
@@ -46,14 +64,218 @@ def gen_outputs2(inputs):
     return itertools.accumulate(inputs, move_dial2, initial=(50, 0))
 
 
+def parse_deltas(data):
+    """Parse a buffer of rotation lines into signed deltas.
+
+    Args:
+        data: The raw file bytes as a uint8 array.
+    Returns:
+        An int64 array, negative for 'L' moves and positive for 'R' moves.
+    """
+    if data.size and data[-1] != NEWLINE:
+        data = np.append(data, np.uint8(NEWLINE))
+    ends = np.flatnonzero(data == NEWLINE)
+    starts = np.zeros_like(ends)
+    starts[1:] = ends[:-1] + 1
+    # Drop a trailing '\r' from Windows line endings.
+    last = data[np.maximum(ends - 1, 0)]
+    ends = ends - ((ends > starts) & (last == CARRIAGE_RETURN))
+    # Skip blank lines.
+    keep = ends > starts
+    starts, ends = starts[keep], ends[keep]
+    dirs = data[starts]
+    if not np.all((dirs == LEFT) | (dirs == RIGHT)):
+        raise ValueError("Not a valid move")
+    # Horner's rule over right-aligned digit columns. Columns that fall
+    # before the first digit of a line contribute a leading zero.
+    width = int((ends - starts).max(initial=1)) - 1
+    clicks = np.zeros(len(starts), dtype=np.int64)
+    for k in range(width):
+        pos = ends - width + k
+        in_number = pos > starts
+        digits = data[np.maximum(pos, 0)].astype(np.int64) - ZERO
+        clicks = clicks * 10 + np.where(in_number, digits, 0)
+    return np.where(dirs == LEFT, -clicks, clicks)
+
+
+def load_deltas(filepath):
+    """Load a whole rotation log as an array of signed deltas."""
+    return parse_deltas(np.fromfile(filepath, dtype=np.uint8))
+
+
+def count_zero_stops(deltas, start=50):
+    """Count moves that leave the dial at 0, like gen_outputs."""
+    positions = (start + np.cumsum(deltas)) % 100
+    return int(np.count_nonzero(positions == 0))
+
+
+def count_zero_hits(deltas, start=50):
+    """Get the final (position, hits) state, like gen_outputs2.
+
+    Works on the unwrapped dial position. A right turn hits 0 once for
+    every multiple of 100 in (before, after]; a left turn once for every
+    multiple of 100 in [after, before).
+    """
+    after = start + np.cumsum(deltas)
+    before = np.empty_like(after)
+    before[:1] = start
+    before[1:] = after[:-1]
+    right_hits = after // 100 - before // 100
+    left_hits = (before - 1) // 100 - (after - 1) // 100
+    hits = np.where(deltas > 0, right_hits, left_hits).sum()
+    final_pos = int(after[-1] % 100) if after.size else start
+    return (final_pos, int(hits))
+
+
+def sum_floor_div(values, weights):
+    """Sum weights[i] * ((p + values[i]) // 100) for every dial start p.
+
+    Args:
+        values: Unwrapped positions relative to the chunk start.
+        weights: +1 or -1 per value.
+    Returns:
+        An int64 array of length 100, indexed by start position p.
+    """
+    quotients, remainders = np.divmod(values, 100)
+    base = int((weights * quotients).sum())
+    by_rem = (np.bincount(remainders[weights > 0], minlength=100)
+              - np.bincount(remainders[weights < 0], minlength=100))
+    # (p + r) // 100 gains 1 over r // 100 exactly when r >= 100 - p.
+    suffix = np.concatenate(([0], np.cumsum(by_rem[::-1])))
+    return base + suffix[:100]
+
+
+def summarize_chunk(deltas):
+    """Fold a chunk of deltas into a (net, stops, hits) summary.
+
+    stops[p] and hits[p] are the part 1 and part 2 counts the chunk
+    produces when the dial enters it at position p, so a summary does
+    not depend on anything before it.
+    """
+    after = np.cumsum(deltas)
+    before = after - deltas
+    net = int(after[-1]) if after.size else 0
+    stops = np.bincount(-after % 100, minlength=100)
+    ones = np.ones_like(deltas)
+    right = deltas > 0
+    # Same crossing rules as count_zero_hits, for every start at once.
+    hits = (sum_floor_div(after[right], ones[right])
+            - sum_floor_div(before[right], ones[right])
+            + sum_floor_div(before[~right] - 1, ones[~right])
+            - sum_floor_div(after[~right] - 1, ones[~right]))
+    return (net, stops, hits)
+
+
+def combine_summaries(first, second):
+    """Combine two adjacent chunk summaries into one.
+
+    The operation is associative, so summaries can be reduced in any
+    grouping, e.g. after being computed in parallel.
+    """
+    net_a, stops_a, hits_a = first
+    net_b, stops_b, hits_b = second
+    # Where the dial enters the second chunk for each start p.
+    shifted = (np.arange(100) + net_a) % 100
+    return (
+        net_a + net_b,
+        stops_a + stops_b[shifted],
+        hits_a + hits_b[shifted],
+    )
+
+
+def gen_chunk_bounds(filepath, chunk_size=CHUNK_SIZE):
+    """Generate (offset, length) byte ranges that end on a line break."""
+    size = os.path.getsize(filepath)
+    if not size:
+        return
+    with open(filepath, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            offset = 0
+            while offset < size:
+                end = mm.find(b"\n", min(offset + chunk_size, size) - 1)
+                end = size if end == -1 else end + 1
+                yield (offset, end - offset)
+                offset = end
+
+
+def summarize_file_chunk(filepath, offset, length):
+    """Summarize one byte range of a rotation log through mmap."""
+    with open(filepath, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Copy the chunk so no buffer export outlives the mmap.
+            data = np.frombuffer(mm[offset:offset + length],
+                                 dtype=np.uint8)
+    return summarize_chunk(parse_deltas(data))
+
+
+def solve_streaming(filepath, start=50, chunk_size=CHUNK_SIZE, workers=1):
+    """Solve both parts in a single pass over the log.
+
+    Args:
+        filepath: The rotation log.
+        start: Where the dial starts.
+        chunk_size: Approximate bytes per chunk.
+        workers: Number of processes summarizing chunks.
+    Returns:
+        (count_zeroes, (final_pos, hits)), like main's two answers.
+    """
+    bounds = list(gen_chunk_bounds(filepath, chunk_size))
+    offsets = [offset for offset, _ in bounds]
+    lengths = [length for _, length in bounds]
+    identity = (0, np.zeros(100, dtype=np.int64),
+                np.zeros(100, dtype=np.int64))
+    paths = itertools.repeat(filepath)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            summaries = list(executor.map(
+                summarize_file_chunk, paths, offsets, lengths
+            ))
+    else:
+        summaries = map(summarize_file_chunk, paths, offsets, lengths)
+    net, stops, hits = functools.reduce(
+        combine_summaries, summaries, identity
+    )
+    return int(stops[start]), ((start + net) % 100, int(hits[start]))
+
+
+def write_random_moves(filepath, count, seed=0):
+    """Write a random rotation log of count lines for benchmarking."""
+    rng = random.Random(seed)
+    with open(filepath, "w") as f:
+        for _ in range(count):
+            f.write(f"{rng.choice('LR')}{rng.randint(0, 999)}\n")
+
+
+def benchmark(counts=(1_000_000, 5_000_000)):
+    """Compare the generator and vectorized solvers on synthetic logs."""
+    for count in counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            filepath = os.path.join(tmp, "moves.txt")
+            write_random_moves(filepath, count)
+
+            t0 = time.perf_counter()
+            results = gen_outputs(gen_inputs(filepath))
+            zeroes = sum(1 for i in results if i == 0)
+            *_, state = gen_outputs2(gen_inputs(filepath))
+            t1 = time.perf_counter()
+            deltas = load_deltas(filepath)
+            zeroes_np = count_zero_stops(deltas)
+            state_np = count_zero_hits(deltas)
+            t2 = time.perf_counter()
+
+        assert (zeroes, state) == (zeroes_np, state_np)
+        print(f"{count} moves:")
+        print(f"\tgenerators: {t1 - t0:.3f}s")
+        print(f"\tvectorized: {t2 - t1:.3f}s")
+
+
 def main():
-    gen_results = gen_outputs(gen_inputs("input.txt"))
-    gen_zeroes = (i for i in gen_results if i == 0)
-    count_zeroes = len(list(gen_zeroes))
+    count_zeroes, final_state = solve_streaming("input.txt")
     print(f"{count_zeroes}")
-
-    gen_results2 = gen_outputs2(gen_inputs("input.txt"))
-    print(f"2nd code: {list(gen_results2)[-1]}")
+    print(f"2nd code: {final_state}")
 
 if __name__ == "__main__":
-    main()
+    if "--bench" in sys.argv[1:]:
+        benchmark()
+    else:
+        main()
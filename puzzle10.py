@@ -1,10 +1,28 @@
 """Advent of Code 2025 Day 10, part 1 and part 2."""
+import argparse
+import hashlib
+import heapq
+import itertools
+import math
+import random
 import re
-from collections import deque
+import sqlite3
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from fractions import Fraction
 
+import numpy as np
 
-import z3
 
+# Branch and bound nodes solve_joltage tries before giving up.
+JOLTAGE_MAX_NODES = 500
+# Simplex pivots before switching to Bland's rule.
+BLAND_AFTER = 200
+# Pivot and feasibility tolerance for the LP relaxation.
+LP_EPS = 1e-9
+# How far from an integer an LP value may be and still count as one.
+INT_EPS = 1e-6
 
 def gen_input(filepath):
     """Generate the input."""
@@ -78,6 +96,102 @@ def gen_target_solutions(machines):
             yield 0
 
 
+def reduce_gf2(buttons):
+    """Gaussian elimination of button masks over GF(2).
+
+    Returns:
+        (basis, null_space): basis maps a pivot light to a reduced mask
+        and the buttons that XOR to it; null_space holds button sets
+        that XOR to no change at all.
+    """
+    basis = {}
+    null_space = []
+    for k, mask in enumerate(buttons):
+        combo = 1 << k
+        while mask:
+            pivot = mask.bit_length() - 1
+            if pivot not in basis:
+                basis[pivot] = (mask, combo)
+                break
+            pivot_mask, pivot_combo = basis[pivot]
+            mask ^= pivot_mask
+            combo ^= pivot_combo
+        else:
+            null_space.append(combo)
+    return basis, null_space
+
+
+def min_weight_null_space(particular, null_space):
+    """Get the fewest presses over particular XOR the null space.
+
+    Walks every combination in Gray code order, one XOR per step.
+    """
+    best = particular.bit_count()
+    current = particular
+    for step in range(1, 1 << len(null_space)):
+        # Gray code flips the vector at the lowest set bit of step.
+        current ^= null_space[(step & -step).bit_length() - 1]
+        best = min(best, current.bit_count())
+    return best
+
+
+def gen_subset_states(buttons):
+    """Generate (state, presses) for every subset of buttons."""
+    states = [0]
+    presses = [0]
+    for mask in buttons:
+        states += [state ^ mask for state in states]
+        presses += [count + 1 for count in presses]
+    return zip(states, presses)
+
+
+def min_weight_meet_in_middle(target, buttons):
+    """Get the fewest presses by splitting the buttons in two halves."""
+    half = len(buttons) // 2
+    left_best = {}
+    for state, presses in gen_subset_states(buttons[:half]):
+        if presses < left_best.get(state, presses + 1):
+            left_best[state] = presses
+    best = None
+    for state, presses in gen_subset_states(buttons[half:]):
+        left = left_best.get(target ^ state)
+        if left is not None and (best is None or left + presses < best):
+            best = left + presses
+    return best
+
+
+def solve_gf2(target, buttons):
+    """Get the fewest presses that reach target, or None if impossible.
+
+    Light toggling is a linear system over GF(2). Reduce the buttons,
+    find one particular solution, then minimize presses over its null
+    space coset, or meet in the middle when that is cheaper.
+    """
+    basis, null_space = reduce_gf2(buttons)
+    particular = 0
+    state = target
+    while state:
+        pivot = state.bit_length() - 1
+        if pivot not in basis:
+            return None
+        pivot_mask, pivot_combo = basis[pivot]
+        state ^= pivot_mask
+        particular ^= pivot_combo
+    if len(null_space) <= (len(buttons) + 1) // 2:
+        return min_weight_null_space(particular, null_space)
+    return min_weight_meet_in_middle(target, buttons)
+
+
+def gen_gf2_solutions(machines):
+    """Generate the fewest presses for each machine with linear algebra."""
+    for idx, (target, buttons) in enumerate(machines):
+        presses = solve_gf2(target, buttons)
+        if presses is None:
+            print(f"Machine {idx+1}: Impossilbe!")
+            presses = 0
+        yield presses
+
+
 def gen_vectors(parsed_strings):
     """Generate vectors."""
     for joltage_str, button_strs in parsed_strings:
@@ -97,64 +211,567 @@ def gen_vectors(parsed_strings):
         yield target_vec, button_vecs
 
 
+def solve_z3(target, buttons):
+    """Use Z3 solver to get the fewest presses, or None if impossible."""
+    # Importing z3 is slow, so only pay for it when it's needed.
+    import z3
+
+    opt = z3.Optimize()
+    # "b_0", "b_1", etc. represent press counts.
+    press_counts = [z3.Int(f'b_{k}') for k in range(len(buttons))]
+
+    for x in press_counts:
+        opt.add(x >= 0)
+
+    num_dims = len(target)
+    for dim in range(num_dims):
+        # Sum of (button_contribution * press_count) == target_value
+        dim_sum = z3.Sum([
+            buttons[k][dim] * press_counts[k]
+            for k in range(len(buttons))
+        ])
+        # Dimension must match target.
+        opt.add(dim_sum == target[dim])
+
+    # Minimize total presses.
+    opt.minimize(z3.Sum(press_counts))
+
+    if opt.check() == z3.sat:
+        model = opt.model()
+        # Extract result as a standard Python int.
+        return sum(model[x].as_long() for x in press_counts)
+    return None
+
+
 def gen_z3_solutions(machines):
     """Use Z3 solver to yield the answer for each machine."""
     for idx, (target, buttons) in enumerate(machines):
-        opt = z3.Optimize()
-        # "b_0", "b_1", etc. represent press counts.
-        press_counts = [z3.Int(f'b_{k}') for k in range(len(buttons))]
-
-        for x in press_counts:
-            opt.add(x >= 0)
-
-        num_dims = len(target)
-        for dim in range(num_dims):
-            # Sum of (button_contribution * press_count) == target_value
-            dim_sum = z3.Sum([
-                buttons[k][dim] * press_counts[k]
-                for k in range(len(buttons))
-            ])
-            # Dimension must match target.
-            opt.add(dim_sum == target[dim])
-
-        # Minimize total presses.
-        opt.minimize(z3.Sum(press_counts))
-
-        if opt.check() == z3.sat:
-            model = opt.model()
-            # Extract result as a standard Python int.
-            result = sum(model[x].as_long() for x in press_counts)
-            yield result
+        result = solve_z3(target, buttons)
+        if result is None:
+            print(f"Machine {idx + 1}: Impossible!")
+            result = 0
+        yield result
+
+
+def reduce_integer_system(target, buttons):
+    """Row-reduce buttons · x = target exactly.
+
+    Returns:
+        None if the system is inconsistent, else (rows, free_vars).
+        Each row is (pivot, scale, rhs, coefs) meaning
+        scale * x[pivot] = rhs - sum(coefs[f] * x[f] for free f), all
+        in integers.
+    """
+    num_buttons = len(buttons)
+    matrix = [
+        [Fraction(button[dim]) for button in buttons] + [Fraction(value)]
+        for dim, value in enumerate(target)
+    ]
+    pivots = []
+    row = 0
+    for col in range(num_buttons):
+        found = next(
+            (r for r in range(row, len(matrix)) if matrix[r][col]), None
+        )
+        if found is None:
+            continue
+        matrix[row], matrix[found] = matrix[found], matrix[row]
+        lead = matrix[row][col]
+        matrix[row] = [value / lead for value in matrix[row]]
+        for other in range(len(matrix)):
+            factor = matrix[other][col]
+            if other != row and factor:
+                matrix[other] = [
+                    value - factor * pivot_value
+                    for value, pivot_value in zip(matrix[other], matrix[row])
+                ]
+        pivots.append(col)
+        row += 1
+    if any(values[-1] for values in matrix[row:]):
+        return None
+    free_vars = [col for col in range(num_buttons) if col not in pivots]
+    rows = []
+    for values, pivot in zip(matrix, pivots):
+        # Clear denominators so the search runs on plain ints.
+        scale = math.lcm(*(value.denominator for value in values))
+        coefs = {f: int(values[f] * scale) for f in free_vars if values[f]}
+        rows.append((pivot, scale, int(values[-1] * scale), coefs))
+    return rows, free_vars
+
+
+def pivot(tableau, basis, row, col):
+    """Pivot a simplex tableau so col enters the basis at row."""
+    tableau[row] /= tableau[row, col]
+    factors = tableau[:, col].copy()
+    factors[row] = 0
+    tableau -= np.outer(factors, tableau[row])
+    basis[row] = col
+
+
+def run_simplex(tableau, basis, num_columns):
+    """Run simplex pivots until the tableau is optimal.
+
+    Only the first num_columns columns may enter the basis. Pivots take
+    the most negative reduced cost, then switch to Bland's rule, which
+    can't cycle, once they run long.
+    """
+    for step in itertools.count():
+        reduced = tableau[-1, :num_columns]
+        entering = np.flatnonzero(reduced < -LP_EPS)
+        if not entering.size:
+            return
+        if step < BLAND_AFTER:
+            col = entering[np.argmin(reduced[entering])]
         else:
+            col = entering[0]
+        positive = np.flatnonzero(tableau[:-1, col] > LP_EPS)
+        ratios = tableau[positive, -1] / tableau[positive, col]
+        ties = positive[ratios <= ratios.min() + LP_EPS]
+        pivot(tableau, basis, min(ties, key=basis.__getitem__), col)
+
+
+def solve_lp(matrix, rhs, costs):
+    """Minimize costs · x subject to matrix · x = rhs and x >= 0.
+
+    A two phase dense simplex. The costs must be non-negative, so the
+    problem is never unbounded.
+
+    Returns:
+        None if infeasible, else (value, x).
+    """
+    num_rows, num_cols = matrix.shape
+    sign = np.where(rhs < 0, -1.0, 1.0)
+    tableau = np.zeros((num_rows + 1, num_cols + num_rows + 1))
+    tableau[:num_rows, :num_cols] = matrix * sign[:, np.newaxis]
+    tableau[:num_rows, num_cols:-1] = np.eye(num_rows)
+    tableau[:num_rows, -1] = rhs * sign
+    # Phase 1: drive the artificial variables to zero.
+    tableau[-1] = -tableau[:num_rows].sum(axis=0)
+    tableau[-1, num_cols:-1] = 0
+    basis = list(range(num_cols, num_cols + num_rows))
+    run_simplex(tableau, basis, num_cols + num_rows)
+    if tableau[-1, -1] < -INT_EPS:
+        return None
+    # Swap zero artificials still in the basis for real columns.
+    for row, var in enumerate(basis):
+        if var >= num_cols:
+            nonzero = np.flatnonzero(np.abs(tableau[row, :num_cols]) > LP_EPS)
+            if nonzero.size:
+                pivot(tableau, basis, row, nonzero[0])
+    # Phase 2: the real costs, with artificials kept out of the basis.
+    tableau[-1] = 0
+    tableau[-1, :num_cols] = costs
+    for row, var in enumerate(basis):
+        if var < num_cols:
+            tableau[-1] -= costs[var] * tableau[row]
+    tableau[-1, num_cols:-1] = 0
+    run_simplex(tableau, basis, num_cols)
+    x = np.zeros(num_cols)
+    for row, var in enumerate(basis):
+        if var < num_cols:
+            x[var] = tableau[row, -1]
+    return -tableau[-1, -1], x
+
+
+def solve_press_lp(counters, target, lower, upper, capped):
+    """Solve the LP relaxation of one branch and bound node.
+
+    Presses are shifted by their lower bounds. Only the capped buttons,
+    whose upper bound is tighter than the counters already imply, get a
+    slack column, so the LP is in solve_lp's equality form.
+
+    Returns:
+        None if infeasible, else (fewest presses, presses).
+    """
+    num_counters, num_buttons = counters.shape
+    num_capped = len(capped)
+    matrix = np.zeros((num_counters + num_capped, num_buttons + num_capped))
+    matrix[:num_counters, :num_buttons] = counters
+    matrix[num_counters:, capped] = np.eye(num_capped)
+    matrix[num_counters:, num_buttons:] = np.eye(num_capped)
+    rhs = np.concatenate((target - counters @ lower,
+                          upper[capped] - lower[capped]))
+    costs = np.concatenate((np.ones(num_buttons), np.zeros(num_capped)))
+    relaxed = solve_lp(matrix, rhs, costs)
+    if relaxed is None:
+        return None
+    value, presses = relaxed
+    return value + lower.sum(), presses[:num_buttons] + lower
+
+
+def solve_joltage(target, buttons, max_nodes=JOLTAGE_MAX_NODES):
+    """Get the fewest presses that reach target, or None if impossible.
+
+    Rejects systems the exact row reduction shows are inconsistent,
+    then runs a best-first branch and bound on the LP relaxation. A
+    button can be pressed at most as often as the smallest target among
+    the counters it feeds. Each node splits on its most fractional
+    press count, and is cut once the relaxation's rounded up optimum
+    can't beat the best total so far. The node budget is small, since
+    Z3 settles the rare hard machine faster than a long search.
+
+    Raises:
+        RuntimeError: The search visited more than max_nodes nodes, or
+            found no integer solution for a consistent system.
+    """
+    if reduce_integer_system(target, buttons) is None:
+        return None
+    counters = np.array(buttons, dtype=float).T
+    target_vec = np.array(target, dtype=float)
+    limits = np.array([
+        min((target[dim] for dim, hit in enumerate(button) if hit),
+            default=0)
+        for button in buttons
+    ], dtype=float)
+    best = None
+    nodes = 0
+    heap = [(0.0, 0, np.zeros(len(buttons)), limits)]
+    tie = itertools.count(1)
+    while heap:
+        nodes += 1
+        if nodes > max_nodes:
+            raise RuntimeError("Branch and bound node limit reached")
+        bound, _, lower, upper = heapq.heappop(heap)
+        if best is not None and math.ceil(bound - INT_EPS) >= best:
+            break
+        if np.any(lower > upper):
+            continue
+        relaxed = solve_press_lp(counters, target_vec, lower, upper,
+                                 np.flatnonzero(upper < limits))
+        if relaxed is None:
+            continue
+        value, presses = relaxed
+        if best is not None and math.ceil(value - INT_EPS) >= best:
+            continue
+        fractions = np.abs(presses - np.round(presses))
+        var = int(np.argmax(fractions))
+        if fractions[var] <= INT_EPS:
+            # Check the rounded presses exactly before trusting them.
+            counts = [round(press) for press in presses.tolist()]
+            if all(sum(count * button[dim]
+                       for count, button in zip(counts, buttons)) == goal
+                   for dim, goal in enumerate(target)):
+                best = sum(counts)
+            continue
+        down = upper.copy()
+        down[var] = math.floor(presses[var])
+        up = lower.copy()
+        up[var] = math.ceil(presses[var])
+        heapq.heappush(heap, (value, next(tie), up, upper))
+        heapq.heappush(heap, (value, next(tie), lower, down))
+    if best is None:
+        raise RuntimeError("No integer solution found")
+    return best
+
+
+def solve_joltage_or_z3(target, buttons):
+    """Solve one joltage machine natively, falling back to Z3."""
+    try:
+        return solve_joltage(target, buttons)
+    except RuntimeError:
+        return solve_z3(target, buttons)
+
+
+def gen_joltage_solutions(machines):
+    """Yield the answer for each machine, falling back to Z3 if needed."""
+    for idx, (target, buttons) in enumerate(machines):
+        result = solve_joltage_or_z3(target, buttons)
+        if result is None:
             print(f"Machine {idx + 1}: Impossible!")
-            yield 0
+            result = 0
+        yield result
+
+
+def machine_cost(machine):
+    """Estimate how hard a machine is: buttons times counters."""
+    target, buttons = machine
+    if isinstance(target, int):
+        # Bitmask machines count lights up to the highest one used.
+        counters = max([target.bit_length()]
+                       + [mask.bit_length() for mask in buttons])
+    else:
+        counters = len(target)
+    return len(buttons) * counters
+
+
+def solve_chunk(solver, machines):
+    """Solve a chunk of machines in a worker process."""
+    return [solver(target, buttons) for target, buttons in machines]
+
+
+def solve_machines(machines, solver, workers=1, chunk_size=8):
+    """Solve machines across a process pool, hardest first.
 
+    Args:
+        machines: A list of (target, buttons) machines.
+        solver: A module level function taking (target, buttons), so it
+            can be pickled. Z3 objects get built inside the workers.
+        workers: Number of processes; 1 solves in this process.
+        chunk_size: Machines sent to a worker at a time.
+    Returns:
+        Each machine's result, in input order.
+    """
+    if workers <= 1:
+        return solve_chunk(solver, machines)
+    order = sorted(range(len(machines)),
+                   key=lambda idx: machine_cost(machines[idx]), reverse=True)
+    results = [None] * len(machines)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for start in range(0, len(order), chunk_size):
+            chunk = order[start:start + chunk_size]
+            future = executor.submit(
+                solve_chunk, solver, [machines[idx] for idx in chunk]
+            )
+            futures[future] = chunk
+        for future in as_completed(futures):
+            for idx, result in zip(futures[future], future.result()):
+                results[idx] = result
+    return results
+
+
+def canonical_key(kind, target, buttons):
+    """Get a content address for a machine, ignoring button order.
+
+    Repeated buttons never change the fewest presses, so they are
+    dropped as well.
+    """
+    canonical = (kind, target, tuple(sorted(set(buttons))))
+    return hashlib.sha256(repr(canonical).encode()).hexdigest()
+
+
+class SolutionCache:
+    """Two level cache of machine results: in-memory LRU over SQLite."""
+
+    MISSING = object()
+
+    def __init__(self, path=None, memory_size=4096, disk_size=1_000_000):
+        """Initialize a SolutionCache.
+
+        Args:
+            path: SQLite file for the disk layer, or None for memory only.
+            memory_size: Results kept in the LRU.
+            disk_size: Results kept on disk before the least recently
+                used ones are evicted.
+        """
+        self.memory = OrderedDict()
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.db = None
+        if path is not None:
+            self.db = sqlite3.connect(path)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, result INTEGER, used INTEGER)"
+            )
+            self.db.execute(
+                "CREATE INDEX IF NOT EXISTS results_used ON results (used)"
+            )
+            row = self.db.execute("SELECT MAX(used) FROM results").fetchone()
+            self.tick = row[0] or 0
 
-def main():
+    def remember(self, key, result):
+        """Put a result in the LRU, dropping the oldest if it's full."""
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    def get(self, key):
+        """Get a cached result, or SolutionCache.MISSING."""
+        if key in self.memory:
+            self.memory_hits += 1
+            self.memory.move_to_end(key)
+            return self.memory[key]
+        if self.db is not None:
+            row = self.db.execute(
+                "SELECT result FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                self.disk_hits += 1
+                self.tick += 1
+                self.db.execute("UPDATE results SET used = ? WHERE key = ?",
+                                (self.tick, key))
+                self.remember(key, row[0])
+                return row[0]
+        self.misses += 1
+        return self.MISSING
+
+    def put(self, key, result):
+        """Store a result; None marks an impossible machine."""
+        self.put_many([(key, result)])
+
+    def put_many(self, items):
+        """Store (key, result) pairs in one disk transaction."""
+        items = list(items)
+        for key, result in items:
+            self.remember(key, result)
+        if self.db is not None and items:
+            rows = [(key, result, self.tick + idx)
+                    for idx, (key, result) in enumerate(items, 1)]
+            self.tick += len(items)
+            self.db.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?)", rows
+            )
+            self.db.execute(
+                "DELETE FROM results WHERE used <= ?",
+                (self.tick - self.disk_size,),
+            )
+            self.db.commit()
+
+    @property
+    def stats(self):
+        """Get the hit and miss counters."""
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
+
+    def close(self):
+        """Close the disk layer."""
+        if self.db is not None:
+            self.db.commit()
+            self.db.close()
+            self.db = None
+
+
+def solve_machines_cached(machines, solver, cache, workers=1):
+    """Solve machines through a SolutionCache, solving only misses.
+
+    The solver's name is part of the key, so part 1 and part 2 can
+    share one cache.
+    """
+    keys = [
+        canonical_key(solver.__name__, target, tuple(buttons))
+        for target, buttons in machines
+    ]
+    # Look each distinct key up once; repeats in the batch share its
+    # result, so they count as memory hits.
+    first = {}
+    for idx, key in enumerate(keys):
+        first.setdefault(key, idx)
+    cache.memory_hits += len(keys) - len(first)
+    found = {key: cache.get(key) for key in first}
+    missing = [key for key, result in found.items()
+               if result is SolutionCache.MISSING]
+    solved = solve_machines([machines[first[key]] for key in missing],
+                            solver, workers)
+    found.update(zip(missing, solved))
+    cache.put_many(zip(missing, solved))
+    return [found[key] for key in keys]
+
+
+def gen_random_machines(count, num_counters, num_buttons, seed=0):
+    """Generate random solvable (target, buttons) machines."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        buttons = []
+        for _ in range(num_buttons):
+            hits = set(rng.sample(range(num_counters),
+                                  rng.randint(1, num_counters)))
+            buttons.append(tuple(int(dim in hits)
+                                 for dim in range(num_counters)))
+        presses = [rng.randint(0, 30) for _ in buttons]
+        target = tuple(
+            sum(p * button[dim] for p, button in zip(presses, buttons))
+            for dim in range(num_counters)
+        )
+        yield target, buttons
+
+
+def benchmark(filename="p10-full-input.txt"):
+    """Compare the native joltage solver against Z3."""
+    inputs = {
+        filename: list(gen_vectors(
+            gen_parsed_joltage_strings(gen_input(filename))
+        )),
+        "synthetic 10x13": list(gen_random_machines(50, 10, 13)),
+        "synthetic 12x20": list(gen_random_machines(20, 12, 20, seed=3)),
+        "synthetic 16x30": list(gen_random_machines(10, 16, 30, seed=4)),
+    }
+    for name, machines in inputs.items():
+        fallbacks = 0
+        native = 0
+        t0 = time.perf_counter()
+        for target, buttons in machines:
+            try:
+                native += solve_joltage(target, buttons) or 0
+            except RuntimeError:
+                fallbacks += 1
+                native += solve_z3(target, buttons) or 0
+        t1 = time.perf_counter()
+        with_z3 = sum(gen_z3_solutions(machines))
+        t2 = time.perf_counter()
+        assert native == with_z3
+        print(f"{name}: {len(machines)} machines")
+        print(f"\tnative: {t1 - t0:.3f}s, {fallbacks} fell back to z3")
+        print(f"\tz3: {t2 - t1:.3f}s")
+
+
+def parse_args(argv=None):
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes to solve machines with")
+    parser.add_argument("--cache", metavar="PATH",
+                        help="SQLite file to cache machine results in")
+    parser.add_argument("--bench", action="store_true",
+                        help="compare the native solver against Z3")
+    return parser.parse_args(argv)
+
+
+def report_impossible(results):
+    """Print impossible machines and count them as 0 presses."""
+    for idx, result in enumerate(results):
+        if result is None:
+            print(f"Machine {idx + 1}: Impossible!")
+    return [0 if result is None else result for result in results]
+
+
+def main(workers=1, cache_path=None):
     """Run the main body of the script."""
+    cache = SolutionCache(cache_path)
     # filename = "p10-sample-input.txt"
     filename = "p10-full-input.txt"
     print("Part 1:")
-    solutions = gen_target_solutions(
+    machines = list(
         gen_bitmasks(
             gen_parsed_strings(
                 gen_input(filename)
             )
         )
     )
+    solutions = report_impossible(
+        solve_machines_cached(machines, solve_gf2, cache, workers)
+    )
     total_presses = sum(solutions)
     print(f"\tTotal: {total_presses}")
     print("Part 2:")
-    joltage_solutions = gen_z3_solutions(
+    joltage_machines = list(
         gen_vectors(
             gen_parsed_joltage_strings(
                 gen_input(filename)
             )
         )
     )
+    joltage_solutions = report_impossible(
+        solve_machines_cached(
+            joltage_machines, solve_joltage_or_z3, cache, workers
+        )
+    )
     total_joltage_presses = sum(joltage_solutions)
     print(f"\tTotal: {total_joltage_presses}")
+    print(f"Cache: {cache.stats}")
+    cache.close()
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.bench:
+        benchmark()
+    else:
+        main(args.workers, args.cache)
@@ -1,7 +1,12 @@
 """Advent of code Day 11, part 1 and part 2."""
+from collections import OrderedDict, deque
 from functools import cache
 
 
+# Count vector entries each PathCounter keeps, across all its vectors.
+VECTOR_CACHE_ENTRIES = 1 << 22
+
+
 def gen_lines(filepath):
     with open(filepath, 'r') as f:
         for line in f:
@@ -32,26 +37,170 @@ def count_paths(graph, start_node, end_node):
     return dfs(start_node)
 
 
+class PathCounter:
+    """Count paths in a DAG from one topological order."""
+
+    def __init__(self, graph, cache_entries=VECTOR_CACHE_ENTRIES):
+        """Initialize a PathCounter and order the graph with Kahn's algorithm.
+
+        Args:
+            graph: Adjacency lists from parse_graph.
+            cache_entries: Total count vector entries to keep; at least
+                one vector is always kept.
+        Raises:
+            ValueError: The graph has a cycle.
+        """
+        self.index = {}
+        for src, dsts in graph.items():
+            for node in (src, *dsts):
+                self.index.setdefault(node, len(self.index))
+        self.adj = [[] for _ in self.index]
+        indegree = [0] * len(self.index)
+        for src, dsts in graph.items():
+            for dst in dsts:
+                self.adj[self.index[src]].append(self.index[dst])
+                indegree[self.index[dst]] += 1
+        queue = deque(i for i, degree in enumerate(indegree) if not degree)
+        self.order = []
+        while queue:
+            node = queue.popleft()
+            self.order.append(node)
+            for neighbor in self.adj[node]:
+                indegree[neighbor] -= 1
+                if not indegree[neighbor]:
+                    queue.append(neighbor)
+        if len(self.order) < len(self.index):
+            names = list(self.index)
+            stuck = sorted(names[i] for i, degree in enumerate(indegree)
+                           if degree)
+            raise ValueError(f"Graph has a cycle through: {stuck[:10]}")
+        self.position = [0] * len(self.order)
+        for pos, node in enumerate(self.order):
+            self.position[node] = pos
+        # LRU of count vectors keyed by (direction, node).
+        self.vectors = OrderedDict()
+        self.max_vectors = max(1, cache_entries // max(1, len(self.order)))
+
+    def remember(self, key, counts):
+        """Put a count vector in the LRU, dropping the oldest if it's full."""
+        self.vectors[key] = counts
+        if len(self.vectors) > self.max_vectors:
+            self.vectors.popitem(last=False)
+
+    def forward(self, source):
+        """Get the number of paths from source to every node."""
+        key = ("forward", source)
+        if key in self.vectors:
+            self.vectors.move_to_end(key)
+            return self.vectors[key]
+        order = self.order
+        counts = [0] * len(order)
+        start = self.index[source]
+        counts[start] = 1
+        for pos in range(self.position[start], len(order)):
+            node = order[pos]
+            paths = counts[node]
+            if paths:
+                for neighbor in self.adj[node]:
+                    counts[neighbor] += paths
+        self.remember(key, counts)
+        return counts
+
+    def backward(self, sink):
+        """Get the number of paths from every node to sink."""
+        key = ("backward", sink)
+        if key in self.vectors:
+            self.vectors.move_to_end(key)
+            return self.vectors[key]
+        order = self.order
+        counts = [0] * len(order)
+        end = self.index[sink]
+        counts[end] = 1
+        for pos in range(self.position[end] - 1, -1, -1):
+            node = order[pos]
+            counts[node] = sum(counts[neighbor]
+                               for neighbor in self.adj[node])
+        self.remember(key, counts)
+        return counts
+
+    def count(self, source, sink):
+        """Count the paths from source to sink."""
+        if source not in self.index or sink not in self.index:
+            return 0
+        if (("forward", source) in self.vectors
+                or ("backward", sink) not in self.vectors):
+            return self.forward(source)[self.index[sink]]
+        return self.backward(sink)[self.index[source]]
+
+    def count_pairs(self, pairs):
+        """Count the paths for each (source, sink) pair.
+
+        Pairs are grouped by whichever side has fewer distinct nodes so
+        each count vector is built once.
+        """
+        pairs = list(pairs)
+        sources = {source for source, _ in pairs}
+        sinks = {sink for _, sink in pairs}
+        by_source = len(sources) <= len(sinks)
+        groups = {}
+        for i, (source, sink) in enumerate(pairs):
+            key = source if by_source else sink
+            groups.setdefault(key, []).append(i)
+        counts = [0] * len(pairs)
+        for key, indices in groups.items():
+            if key not in self.index:
+                continue
+            vector = self.forward(key) if by_source else self.backward(key)
+            for i in indices:
+                other = pairs[i][1] if by_source else pairs[i][0]
+                if other in self.index:
+                    counts[i] = vector[self.index[other]]
+        return counts
+
+    def count_many(self, sources, sinks):
+        """Count the paths from any of sources to any of sinks."""
+        return sum(self.count_pairs((source, sink)
+                                    for source in sources
+                                    for sink in sinks))
+
+    def count_via(self, source, sink, waypoints):
+        """Count the paths from source to sink visiting every waypoint.
+
+        In a DAG a path can only meet the waypoints in topological
+        order, so one chain of segment counts covers every ordering.
+        """
+        if any(node not in self.index for node in (source, sink, *waypoints)):
+            return 0
+        stops = sorted(waypoints,
+                       key=lambda node: self.position[self.index[node]])
+        total = 1
+        for start, end in zip([source, *stops], [*stops, sink]):
+            total *= self.count(start, end)
+            if not total:
+                break
+        return total
+
+
 def main():
     # filepath = "p11-sample-input.txt"
     filepath = "p11-full-input.txt"
     graph = parse_graph(gen_lines(filepath))
+    counter = PathCounter(graph)
     print("Part 1:")
-    total_paths = count_paths(graph, "you", "out")
+    total_paths = counter.count("you", "out")
     print(f"\tTotal Paths: {total_paths}")
-    graph = parse_graph(gen_lines(filepath))
     print("Part 2:")
-    svr_dac = count_paths(graph, "svr", "dac")
-    dac_fft = count_paths(graph, "dac", "fft")
-    fft_out = count_paths(graph, "fft", "out")
+    svr_dac = counter.count("svr", "dac")
+    dac_fft = counter.count("dac", "fft")
+    fft_out = counter.count("fft", "out")
     scenario1 = svr_dac * dac_fft * fft_out
-    svr_fft = count_paths(graph, "svr", "fft")
-    fft_dac = count_paths(graph, "fft", "dac")
-    dac_out = count_paths(graph, "dac", "out")
+    svr_fft = counter.count("svr", "fft")
+    fft_dac = counter.count("fft", "dac")
+    dac_out = counter.count("dac", "out")
     scenario2 = svr_fft * fft_dac * dac_out
     print(f"\tScenario 1: {scenario1=}")
     print(f"\tScenario 2: {scenario2=}")
-    total_paths = scenario1 + scenario2
+    total_paths = counter.count_via("svr", "out", ["dac", "fft"])
     print(f"\tTotal Paths: {total_paths}")
 
 
@@ -1,6 +1,13 @@
 """Advent of Code 2025: Puzzle 2, part 1 and part 2."""
+import bisect
+import heapq
 import itertools
+import math
+import mmap
+import os
 import re
+import struct
+from array import array
 from collections.abc import Iterable
 
 
@@ -46,12 +53,244 @@ def gen_invalid_ids2(ranges: Iterable):
     return (i for i in all_ids if re.match(r'(\d+)\1+$', str(i)))
 
 
+def gen_block_lengths(digits: int, any_repeat: bool):
+    """Generate the block lengths a digits-long invalid id can repeat.
+
+    Args:
+        digits: Length of the id.
+        any_repeat: False for part 1 (exactly twice), True for part 2.
+    """
+    if any_repeat:
+        yield from (b for b in range(1, digits) if digits % b == 0)
+    elif digits % 2 == 0:
+        yield digits // 2
+
+
+def get_pattern_bounds(start: int, stop: int, digits: int, block: int):
+    """Get the patterns whose repeats land in range(start, stop).
+
+    A digits-long id made of one block-long pattern repeated is the
+    pattern times a multiplier like 11, 101, 1001 or 10101.
+
+    Returns:
+        (multiplier, first_pattern, last_pattern). Empty when
+        first_pattern > last_pattern.
+    """
+    multiplier = (10**digits - 1) // (10**block - 1)
+    low = max(start, 10**(digits - 1))
+    high = min(stop - 1, 10**digits - 1)
+    first = max(10**(block - 1), -(-low // multiplier))
+    last = min(10**block - 1, high // multiplier)
+    return multiplier, first, last
+
+
+def sum_patterns(start: int, stop: int, digits: int, block: int) -> int:
+    """Sum the block-long repeats in range(start, stop) in closed form."""
+    multiplier, first, last = get_pattern_bounds(start, stop, digits, block)
+    if first > last:
+        return 0
+    return multiplier * (first + last) * (last - first + 1) // 2
+
+
+def gen_digit_counts(start: int, stop: int):
+    """Generate the id lengths present in range(start, stop)."""
+    if stop > start:
+        yield from range(len(str(start)), len(str(stop - 1)) + 1)
+
+
+def gen_prime_factors(num: int):
+    """Generate the distinct prime factors of a small number."""
+    factor = 2
+    while factor * factor <= num:
+        if num % factor == 0:
+            yield factor
+            while num % factor == 0:
+                num //= factor
+        factor += 1
+    if num > 1:
+        yield num
+
+
+def sum_repeats(start: int, stop: int, digits: int) -> int:
+    """Sum the digits-long ids in range(start, stop) with any repeat.
+
+    Every repeated id is a repeat of some block digits // p for a prime
+    p dividing digits, and the blocks for a set of primes overlap in
+    the block digits // product. Inclusion-exclusion over the primes
+    counts each id exactly once.
+    """
+    primes = list(gen_prime_factors(digits))
+    total = 0
+    for size in range(1, len(primes) + 1):
+        sign = 1 if size % 2 else -1
+        for subset in itertools.combinations(primes, size):
+            block = digits // math.prod(subset)
+            total += sign * sum_patterns(start, stop, digits, block)
+    return total
+
+
+def is_primitive_pattern(pattern: int) -> bool:
+    """Check the pattern isn't itself a repeat of a shorter block."""
+    return not re.match(r'(\d+)\1+$', str(pattern))
+
+
+def gen_block_ids(start, stop, digits, block, any_repeat):
+    """Generate the block-long repeats in range(start, stop) in order."""
+    multiplier, first, last = get_pattern_bounds(start, stop, digits, block)
+    for pattern in range(first, last + 1):
+        # Skip ids already produced by a shorter block.
+        if not any_repeat or is_primitive_pattern(pattern):
+            yield pattern * multiplier
+
+
+def gen_range_pattern_ids(range_str: str, any_repeat: bool):
+    """Generate the invalid ids of one range in ascending order."""
+    ids = range_from_str(range_str)
+    for digits in gen_digit_counts(ids.start, ids.stop):
+        yield from heapq.merge(*(
+            gen_block_ids(ids.start, ids.stop, digits, block, any_repeat)
+            for block in gen_block_lengths(digits, any_repeat)
+        ))
+
+
+def gen_pattern_ids(ranges: Iterable):
+    """Generate invalid ids for 1st part by building the repeats."""
+    for range_str in ranges:
+        yield from gen_range_pattern_ids(range_str, any_repeat=False)
+
+
+def gen_pattern_ids2(ranges: Iterable):
+    """Generate invalid ids for 2nd part by building the repeats."""
+    for range_str in ranges:
+        yield from gen_range_pattern_ids(range_str, any_repeat=True)
+
+
+def sum_pattern_ids(ranges: Iterable) -> int:
+    """Sum invalid ids for 1st part without visiting each one."""
+    total = 0
+    for range_str in ranges:
+        ids = range_from_str(range_str)
+        for digits in gen_digit_counts(ids.start, ids.stop):
+            for block in gen_block_lengths(digits, any_repeat=False):
+                total += sum_patterns(ids.start, ids.stop, digits, block)
+    return total
+
+
+def sum_pattern_ids2(ranges: Iterable) -> int:
+    """Sum invalid ids for 2nd part without visiting each one."""
+    total = 0
+    for range_str in ranges:
+        ids = range_from_str(range_str)
+        for digits in gen_digit_counts(ids.start, ids.stop):
+            total += sum_repeats(ids.start, ids.stop, digits)
+    return total
+
+
+INDEX_MAGIC = b"AOC2IDX1"
+INDEX_HEADER = struct.Struct("=8sQQQ")
+# Each record is (id, low word, high word) of the running sum up to and
+# including the id, so sums past 64 bits stay exact.
+RECORD_WORDS = 3
+WORD_MASK = (1 << 64) - 1
+
+
+def build_index_file(filepath, width: int, any_repeat: bool):
+    """Write every invalid id below 10**width with running sums."""
+    tmp_path = f"{filepath}.tmp"
+    count = 0
+    running = 0
+    with open(tmp_path, "wb") as f:
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, width, any_repeat, 0))
+        records = array("Q")
+        for invalid_id in gen_range_pattern_ids(f"1-{10**width}", any_repeat):
+            running += invalid_id
+            records.extend((invalid_id, running & WORD_MASK, running >> 64))
+            count += 1
+            if len(records) >= 1 << 16:
+                records.tofile(f)
+                records = array("Q")
+        records.tofile(f)
+        f.seek(0)
+        f.write(INDEX_HEADER.pack(INDEX_MAGIC, width, any_repeat, count))
+    os.replace(tmp_path, filepath)
+
+
+def read_index_width(filepath, any_repeat: bool) -> int:
+    """Get the width an index file was built for, or 0 if unusable."""
+    try:
+        with open(filepath, "rb") as f:
+            header = f.read(INDEX_HEADER.size)
+    except FileNotFoundError:
+        return 0
+    if len(header) < INDEX_HEADER.size:
+        return 0
+    magic, width, kind, _ = INDEX_HEADER.unpack(header)
+    if magic != INDEX_MAGIC or kind != any_repeat:
+        return 0
+    return width
+
+
+class InvalidIdIndex:
+    """Sorted, memory-mapped index of invalid ids with prefix sums."""
+
+    def __init__(self, filepath, width: int = 12, any_repeat: bool = True):
+        """Open the index, rebuilding it only if it is too narrow.
+
+        Args:
+            filepath: Where the index lives on disk.
+            width: Largest id length queries will need.
+            any_repeat: False for part 1 ids, True for part 2 ids.
+        """
+        if read_index_width(filepath, any_repeat) < width:
+            build_index_file(filepath, width, any_repeat)
+        self.file = open(filepath, "rb")
+        self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        _, self.width, _, self.count = INDEX_HEADER.unpack_from(self.mm)
+        self.words = memoryview(self.mm)[INDEX_HEADER.size:].cast("Q")
+        self.ids = self.words[::RECORD_WORDS]
+
+    def prefix_sum(self, position: int) -> int:
+        """Sum of the first position ids."""
+        if position == 0:
+            return 0
+        base = (position - 1) * RECORD_WORDS
+        return self.words[base + 1] | (self.words[base + 2] << 64)
+
+    def query(self, range_str: str) -> tuple[int, int]:
+        """Get (count, sum) of the invalid ids in a range string.
+
+        Args:
+            range_str: Like, "1-10", with range_from_str's bounds.
+        """
+        ids = range_from_str(range_str)
+        if ids.stop > 10**self.width:
+            raise ValueError(f"Range {range_str} exceeds index width")
+        lo = bisect.bisect_left(self.ids, ids.start)
+        hi = bisect.bisect_left(self.ids, ids.stop)
+        if hi <= lo:
+            return 0, 0
+        return hi - lo, self.prefix_sum(hi) - self.prefix_sum(lo)
+
+    def close(self):
+        """Release the memory map and file."""
+        self.ids.release()
+        self.words.release()
+        self.mm.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
 def main():
     """Run the main body of the script."""
-    invalid_ids1 = gen_invalid_ids(gen_str_ranges("input2.txt"))
-    invalid_ids2 = gen_invalid_ids2(gen_str_ranges("input2.txt"))
-    print(f"sum(invalid_ids1): {sum(invalid_ids1)}")
-    print(f"sum(invalid_ids2): {sum(invalid_ids2)}")
+    invalid_sum1 = sum_pattern_ids(gen_str_ranges("input2.txt"))
+    invalid_sum2 = sum_pattern_ids2(gen_str_ranges("input2.txt"))
+    print(f"sum(invalid_ids1): {invalid_sum1}")
+    print(f"sum(invalid_ids2): {invalid_sum2}")
 
 
 if __name__ == "__main__":
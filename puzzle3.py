@@ -1,4 +1,5 @@
 """Advent of Code puzzle3 part 1 and part 2."""
+import numpy as np
 
 
 def gen_input(filepath):
@@ -25,6 +26,66 @@ def get_max_subsequence_joltages(line: str, count: int = 12) -> tuple[int]:
     return tuple(result_digits)
 
 
+def get_max_subsequence_stack(line: str, count: int = 12) -> tuple[int]:
+    """Get max subsequence joltages with a monotonic stack in O(n)."""
+    # How many digits we can still afford to throw away.
+    drops = len(line) - count
+    if drops < 0:
+        raise ValueError(f"Can't pick {count} digits from {len(line)}")
+    stack = []
+    for digit in map(int, line):
+        # A bigger digit replaces smaller ones before it while we can drop.
+        while drops > 0 and stack and stack[-1] < digit:
+            stack.pop()
+            drops -= 1
+        stack.append(digit)
+    return tuple(stack[:count])
+
+
+def build_sparse_table(digits: list[int]) -> list[list[int]]:
+    """Build a sparse table of leftmost max positions.
+
+    table[k][i] is the index of the leftmost largest digit in
+    digits[i:i + 2**k].
+    """
+    table = [list(range(len(digits)))]
+    span = 1
+    while 2 * span <= len(digits):
+        prev = table[-1]
+        level = []
+        for i in range(len(digits) - 2 * span + 1):
+            left, right = prev[i], prev[i + span]
+            level.append(left if digits[left] >= digits[right] else right)
+        table.append(level)
+        span *= 2
+    return table
+
+
+def query_max_index(digits, table, lo: int, hi: int) -> int:
+    """Get the index of the leftmost max digit in digits[lo:hi]."""
+    level = (hi - lo).bit_length() - 1
+    left = table[level][lo]
+    right = table[level][hi - (1 << level)]
+    return left if digits[left] >= digits[right] else right
+
+
+def get_max_subsequence_rmq(digits, table, count: int = 12) -> tuple[int]:
+    """Get max subsequence joltages with O(1) range max queries.
+
+    Reuse one table across many counts for the same line.
+    """
+    if count > len(digits):
+        raise ValueError(f"Can't pick {count} digits from {len(digits)}")
+    result_digits = []
+    current = 0
+    for remaining_needed in range(count, 0, -1):
+        limit = len(digits) - remaining_needed + 1
+        best = query_max_index(digits, table, current, limit)
+        result_digits.append(digits[best])
+        current = best + 1
+    return tuple(result_digits)
+
+
 def get_two_joltages(line: str) -> tuple[int]:
     """Get the max 2 joltages from string."""
     max_first_joltage = 0
@@ -45,15 +106,76 @@ def make_final_joltage(joltages: tuple[int]) -> str:
     return ''.join(map(str, joltages))
 
 
+def joltage_value(joltages) -> int:
+    """Put joltages into a single integer."""
+    value = 0
+    for joltage in joltages:
+        value = value * 10 + int(joltage)
+    return value
+
+
 def get_total_output_joltage(lines: list, joltage_getter) -> int:
     """Get the total output joltage from lines."""
-    joltages_str = []
-    for line in lines:
-        joltages_str.append(
-            make_final_joltage(joltage_getter(line))
-        )
-    joltages_int = map(int, joltages_str)
-    return sum(joltages_int)
+    return sum(joltage_value(joltage_getter(line)) for line in lines)
+
+
+def load_banks(filepath) -> dict[int, np.ndarray]:
+    """Load battery banks as digit matrices bucketed by line length.
+
+    Returns:
+        A dict from line length to a (rows, length) uint8 matrix of
+        digit values.
+    """
+    with open(filepath, 'rb') as f:
+        data = np.frombuffer(f.read(), dtype=np.uint8)
+    data = np.append(data, np.uint8(ord('\n')))
+    ends = np.flatnonzero(data == ord('\n'))
+    starts = np.zeros_like(ends)
+    starts[1:] = ends[:-1] + 1
+    last = data[np.maximum(ends - 1, 0)]
+    ends = ends - ((ends > starts) & (last == ord('\r')))
+    lengths = ends - starts
+    banks = {}
+    for length in np.unique(lengths[lengths > 0]).tolist():
+        rows = starts[lengths == length]
+        cells = rows[:, np.newaxis] + np.arange(length)
+        banks[length] = data[cells] - ord('0')
+    return banks
+
+
+def get_bank_total_joltage(bank: np.ndarray, count: int) -> int:
+    """Get the total joltage of equal-length rows in one pass per digit.
+
+    Every row picks its leftmost max digit from its own window at the
+    same time. The total is built from per-digit column sums, so rows
+    never turn into Python ints.
+    """
+    num_rows, length = bank.shape
+    if count > length:
+        raise ValueError(f"Can't pick {count} digits from {length}")
+    # Digits fit in int8, which leaves room for a -1 mask value.
+    signed = bank.view(np.int8)
+    columns = np.arange(length)
+    current = np.zeros(num_rows, dtype=np.intp)
+    row_ids = np.arange(num_rows)
+    total = 0
+    for remaining_needed in range(count, 0, -1):
+        limit = length - remaining_needed + 1
+        # Hide digits before current from argmax; the slice stops at limit.
+        window = np.where(columns[:limit] >= current[:, np.newaxis],
+                          signed[:, :limit], -1)
+        best = np.argmax(window, axis=1)
+        total = total * 10 + int(bank[row_ids, best].sum(dtype=np.int64))
+        current = best + 1
+    return total
+
+
+def get_total_output_joltage_batch(banks: dict, count: int) -> int:
+    """Get the total output joltage from load_banks buckets."""
+    return sum(
+        get_bank_total_joltage(bank, count)
+        for bank in banks.values()
+    )
 
 
 def main():
@@ -64,7 +186,7 @@ def main():
     print(f"\t{output_joltage=}")
     print("Part 2:")
     output_joltage = get_total_output_joltage(
-        lines, get_max_subsequence_joltages
+        lines, get_max_subsequence_stack
     )
     print(f"\t{output_joltage=}")
 
@@ -1,5 +1,9 @@
 """Advent of Code puzzle4 part 1."""
-import copy
+import sys
+import time
+from collections import deque
+
+import numpy as np
 
 
 def gen_input(filepath):
@@ -39,17 +43,43 @@ def check_neighbors(grid, row, col):
     return neighbors < 4
 
 
+def build_plane(grid):
+    """Build a bool plane of rolls from the grid.
+
+    Args:
+        grid: A list of rows from build_grid, or a plane already.
+    """
+    if isinstance(grid, np.ndarray):
+        return grid.astype(bool)
+    return np.array([[char == '@' for char in row] for row in grid],
+                    dtype=bool)
+
+
+def load_plane(filepath):
+    """Load the grid file straight into a bool plane."""
+    with open(filepath, 'rb') as f:
+        rows = f.read().split()
+    data = np.frombuffer(b''.join(rows), dtype=np.uint8)
+    return (data == ord('@')).reshape(len(rows), -1)
+
+
+def count_plane_neighbors(plane):
+    """Count the rolls around every cell with 8 shifted adds."""
+    rows, cols = plane.shape
+    padded = np.pad(plane, 1).view(np.uint8)
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for dr in range(3):
+        for dc in range(3):
+            if (dr, dc) != (1, 1):
+                counts += padded[dr:dr + rows, dc:dc + cols]
+    return counts
+
+
 def check_grid_accessible(grid):
     """Check for the number of accessible slots in the grid."""
-    rows = len(grid)
-    cols = len(grid[0])
-    accessible = 0
-    for row in range(rows):
-        for col in range(cols):
-            if grid[row][col] == '@':
-                if check_neighbors(grid, row, col):
-                    accessible += 1
-    return accessible
+    plane = build_plane(grid)
+    accessible = plane & (count_plane_neighbors(plane) < 4)
+    return int(np.count_nonzero(accessible))
 
 
 def get_removable(grid):
@@ -66,19 +96,79 @@ def get_removable(grid):
 
 
 def check_total_removed(grid):
-    """Find the total number we can remove by repeating removals."""
-    mygrid = copy.copy(grid)
+    """Find the total number we can remove by repeating removals.
+
+    Each round is a handful of whole-plane operations: find the rolls
+    with fewer than 4 neighbors, clear them, and subtract their
+    contribution from the neighbor counts.
+    """
+    plane = build_plane(grid)
+    counts = count_plane_neighbors(plane)
     total_removed = 0
     while True:
-        removable = get_removable(mygrid)
-        if not removable:
+        removable = plane & (counts < 4)
+        removed = int(np.count_nonzero(removable))
+        if not removed:
             break
-        total_removed += len(removable)
-        for row, col in removable:
-            mygrid[row][col] = '.'
+        total_removed += removed
+        plane &= ~removable
+        counts -= count_plane_neighbors(removable)
+    return total_removed
+
+
+def peel_total_removed(grid):
+    """Find the total number we can remove, like k-core peeling.
+
+    Removal only ever lowers neighbor counts, so removing cells one at a
+    time reaches the same end state as removing them in rounds. Each
+    roll is queued once when it drops below 4 neighbors, and removing
+    it only touches its 8 neighbors, so the work is linear in the grid.
+    """
+    # Flat grid with a one-cell border so neighbors never go out of bounds.
+    plane = np.pad(build_plane(grid), 1)
+    width = plane.shape[1]
+    offsets = (
+        -width - 1, -width, -width + 1,
+        -1,                 1,
+        width - 1,  width,  width + 1,
+    )
+    # Counts never exceed 8, so one byte per cell holds them.
+    plane_counts = count_plane_neighbors(plane)
+    present = bytearray(plane.tobytes())
+    counts = bytearray(plane_counts.tobytes())
+    queue = deque(np.flatnonzero(plane & (plane_counts < 4)).tolist())
+    # Rolls that are not yet queued for removal.
+    waiting = bytearray((plane & (plane_counts >= 4)).tobytes())
+    total_removed = 0
+    while queue:
+        cell = queue.popleft()
+        present[cell] = 0
+        total_removed += 1
+        for d in offsets:
+            neighbor = cell + d
+            if present[neighbor]:
+                counts[neighbor] -= 1
+                if waiting[neighbor] and counts[neighbor] < 4:
+                    waiting[neighbor] = 0
+                    queue.append(neighbor)
     return total_removed
 
 
+def benchmark(sizes=(140, 1000, 5000, 20000), seed=0):
+    """Time both part solvers on random square planes."""
+    rng = np.random.default_rng(seed)
+    for size in sizes:
+        plane = rng.integers(0, 10, (size, size), dtype=np.uint8) < 7
+        t0 = time.perf_counter()
+        check_grid_accessible(plane)
+        t1 = time.perf_counter()
+        check_total_removed(plane)
+        t2 = time.perf_counter()
+        print(f"{size}x{size}:")
+        print(f"\tcheck_grid_accessible: {t1 - t0:.3f}s")
+        print(f"\tcheck_total_removed: {t2 - t1:.3f}s")
+
+
 def main():
     """Run the main body of the script."""
     lines = list(gen_input("p4-full-input.txt"))
@@ -92,4 +182,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if "--bench" in sys.argv[1:]:
+        benchmark()
+    else:
+        main()
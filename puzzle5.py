@@ -1,4 +1,9 @@
 """Advent of Code 2025 Day 5."""
+import bisect
+import random
+import sys
+import time
+from array import array
 
 
 def gen_str_ranges(filepath):
@@ -26,6 +31,21 @@ def gen_ingredients(filepath):
                     yield int(ingredient)
 
 
+def read_input(filepath):
+    """Read the ranges and ingredients in one pass over the file."""
+    ranges = []
+    ingredients = []
+    with open(filepath, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if '-' in line:
+                start, end = map(int, line.split('-'))
+                ranges.append((start, end))
+            elif line:
+                ingredients.append(int(line))
+    return ranges, ingredients
+
+
 def is_fresh(ingredient, ranges):
     """Check if the ingredient appears in the ranges."""
     for start, end in ranges:
@@ -50,22 +70,221 @@ def merge_ranges(ranges):
     return merged_ranges
 
 
+class FreshIndex:
+    """Merged fresh ranges stored as parallel sorted arrays."""
+
+    def __init__(self, ranges):
+        """Initialize a FreshIndex from (start, end) ranges."""
+        merged_ranges = merge_ranges(ranges)
+        self.starts = array('q', (start for start, _ in merged_ranges))
+        self.ends = array('q', (end for _, end in merged_ranges))
+
+    def __contains__(self, ingredient):
+        """Check if the ingredient is fresh with one bisect."""
+        # The last range starting at or before the ingredient.
+        pos = bisect.bisect_right(self.starts, ingredient) - 1
+        return pos >= 0 and ingredient <= self.ends[pos]
+
+    def count_fresh(self, ingredients):
+        """Count the fresh ingredients in one sorted sweep."""
+        count = 0
+        pos = 0
+        num_ranges = len(self.starts)
+        for ingredient in sorted(ingredients):
+            # Skip ranges that end before this ingredient.
+            while pos < num_ranges and self.ends[pos] < ingredient:
+                pos += 1
+            if pos == num_ranges:
+                break
+            if self.starts[pos] <= ingredient:
+                count += 1
+        return count
+
+    def total_fresh(self):
+        """Count every id covered by the ranges."""
+        return sum(
+            end - start + 1 for start, end in zip(self.starts, self.ends)
+        )
+
+
+class IntervalNode:
+    """Treap node holding one disjoint range."""
+
+    __slots__ = ('start', 'end', 'priority', 'left', 'right', 'covered')
+
+    def __init__(self, start, end):
+        """Initialize a leaf for the range start..end."""
+        self.start = start
+        self.end = end
+        self.priority = random.random()
+        self.left = None
+        self.right = None
+        # Ids covered by this whole subtree.
+        self.covered = end - start + 1
+
+
+def covered(node):
+    """Get the ids covered by a subtree."""
+    return node.covered if node else 0
+
+
+def update(node):
+    """Recompute a node's subtree total from its children."""
+    node.covered = (covered(node.left) + covered(node.right)
+                    + node.end - node.start + 1)
+    return node
+
+
+def split(node, key):
+    """Split a treap into nodes starting before key and the rest."""
+    if node is None:
+        return None, None
+    if node.start < key:
+        node.right, rest = split(node.right, key)
+        return update(node), rest
+    before, node.left = split(node.left, key)
+    return before, update(node)
+
+
+def merge(first, second):
+    """Join two treaps where every start in first is smaller."""
+    if first is None or second is None:
+        return first or second
+    if first.priority > second.priority:
+        first.right = merge(first.right, second)
+        return update(first)
+    second.left = merge(first, second.left)
+    return update(second)
+
+
+def rightmost(node):
+    """Get the range with the largest start in a treap."""
+    while node and node.right:
+        node = node.right
+    return node
+
+
+class IntervalSet:
+    """Disjoint fresh ranges that stay merged under inserts and removes.
+
+    Ranges live in a treap keyed on their start, so updates and point
+    queries take O(log n) expected time. Adjacent ranges are joined, and
+    the number of covered ids (the part 2 answer) is kept as a running
+    total.
+    """
+
+    def __init__(self, ranges=()):
+        """Initialize an IntervalSet from (start, end) ranges."""
+        self.root = None
+        for start, end in ranges:
+            self.insert(start, end)
+
+    @property
+    def total(self):
+        """Count every id covered by the ranges."""
+        return covered(self.root)
+
+    def insert(self, start, end):
+        """Mark start..end fresh, merging with anything it touches."""
+        before, after = split(self.root, start)
+        last = rightmost(before)
+        if last and last.end >= start - 1:
+            before, _ = split(before, last.start)
+            start = last.start
+            end = max(end, last.end)
+        # Ranges starting inside start..end + 1 are swallowed.
+        inside, after = split(after, end + 2)
+        if inside:
+            end = max(end, rightmost(inside).end)
+        self.root = merge(merge(before, IntervalNode(start, end)), after)
+
+    def remove(self, start, end):
+        """Mark start..end not fresh, trimming the ranges it cuts."""
+        before, after = split(self.root, start)
+        pieces = []
+        last = rightmost(before)
+        if last and last.end >= start:
+            before, _ = split(before, last.start)
+            pieces.append((last.start, start - 1))
+            if last.end > end:
+                pieces.append((end + 1, last.end))
+        inside, after = split(after, end + 1)
+        if inside and rightmost(inside).end > end:
+            pieces.append((end + 1, rightmost(inside).end))
+        for piece_start, piece_end in pieces:
+            before = merge(before, IntervalNode(piece_start, piece_end))
+        self.root = merge(before, after)
+
+    def __contains__(self, ingredient):
+        """Check if the ingredient is fresh."""
+        node = self.root
+        best = None
+        while node:
+            if node.start <= ingredient:
+                best = node
+                node = node.right
+            else:
+                node = node.left
+        return best is not None and ingredient <= best.end
+
+    def __iter__(self):
+        """Generate the merged ranges in order."""
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield (node.start, node.end)
+            node = node.right
+
+
+def benchmark(num_updates=3_000, span=10**12, seed=0):
+    """Compare IntervalSet inserts against re-merging after each one."""
+    rng = random.Random(seed)
+    updates = []
+    for _ in range(num_updates):
+        start = rng.randrange(span)
+        updates.append((start, start + rng.randrange(span // 1000)))
+
+    t0 = time.perf_counter()
+    ranges = []
+    for update_range in updates:
+        ranges.append(update_range)
+        remerged_total = sum(
+            end - start + 1 for start, end in merge_ranges(ranges)
+        )
+    t1 = time.perf_counter()
+    fresh = IntervalSet()
+    for start, end in updates:
+        fresh.insert(start, end)
+    t2 = time.perf_counter()
+    assert fresh.total == remerged_total
+    for start, end in updates[::2]:
+        fresh.remove(start, end)
+    t3 = time.perf_counter()
+
+    print(f"{num_updates} updates:")
+    print(f"\tre-merge inserts: {t1 - t0:.3f}s")
+    print(f"\tIntervalSet inserts: {t2 - t1:.3f}s")
+    print(f"\tIntervalSet removes: {t3 - t2:.3f}s")
+
+
 def main():
     """Run the main body of the script."""
-    ranges = list(gen_range_values(gen_str_ranges("p5-full-input.txt")))
-    count_fresh = 0
-    for i in gen_ingredients("p5-full-input.txt"):
-        if is_fresh(i, ranges):
-            count_fresh += 1
+    ranges, ingredients = read_input("p5-full-input.txt")
+    index = FreshIndex(ranges)
+    count_fresh = index.count_fresh(ingredients)
     print("Part 1:")
     print(f"\t{count_fresh=}")
     print("Part 2:")
-    merged_ranges = merge_ranges(ranges)
-    total_fresh = 0
-    for start, end in merged_ranges:
-        total_fresh += (end - start + 1)
+    total_fresh = index.total_fresh()
     print(f"\t{total_fresh=}")
 
 
 if __name__ == "__main__":
-    main()
+    if "--bench" in sys.argv[1:]:
+        benchmark()
+    else:
+        main()
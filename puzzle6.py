@@ -1,7 +1,20 @@
 """Advent of Code 2025 Day 6 part 2."""
+import math
+import mmap
 import operator
 from functools import reduce
 
+import numpy as np
+
+
+SPACE = ord(' ')
+# Products whose estimated size stays under this many digits fit int64.
+INT64_DIGITS = 18
+INT64_MAX = float(np.iinfo(np.int64).max)
+# Problems with more operands than this multiply with a product tree.
+PRODUCT_TREE_MIN = 16
+BLOCK_SIZE = 1 << 16
+
 
 def get_input(filepath):
     """Generate the input."""
@@ -20,6 +33,29 @@ def get_columns(lines):
     return list(zip(*grid))
 
 
+def product_tree(nums):
+    """Multiply numbers pairwise so big factors stay balanced."""
+    while len(nums) > 1:
+        paired = [nums[i] * nums[i + 1] for i in range(0, len(nums) - 1, 2)]
+        if len(nums) % 2:
+            paired.append(nums[-1])
+        nums = paired
+    return nums[0]
+
+
+def evaluate_problem(op, nums):
+    """Evaluate one problem's numbers with its operator."""
+    match op:
+        case '+':
+            return reduce(operator.add, nums)
+        case '*':
+            if len(nums) > PRODUCT_TREE_MIN:
+                return product_tree(nums)
+            return reduce(operator.mul, nums)
+        case _:
+            raise ValueError(f"Invalid operator: {op}")
+
+
 def calculate_columns(cols):
     """Calculate the result of each column, scan right to left."""
     total = 0
@@ -28,13 +64,7 @@ def calculate_columns(cols):
     for col in reversed(cols):
         if all(c == ' ' for c in col):
             if cur_nums and cur_op:
-                match cur_op:
-                    case '+':
-                        total += reduce(operator.add, cur_nums)
-                    case '*':
-                        total += reduce(operator.mul, cur_nums)
-                    case _:
-                        raise ValueError(f"Invalid operator: {cur_op}")
+                total += evaluate_problem(cur_op, cur_nums)
             cur_nums = []
             cur_op = None
             continue
@@ -48,22 +78,185 @@ def calculate_columns(cols):
             cur_op = bottom_char
 
     if cur_nums and cur_op:
-        match cur_op:
-            case '+':
-                total += reduce(operator.add, cur_nums)
-            case '*':
-                total += reduce(operator.mul, cur_nums)
-            case _:
-                raise ValueError(f"Invalid operator: {cur_op}")
+        total += evaluate_problem(cur_op, cur_nums)
+    return total
+
+
+def load_worksheet(filepath):
+    """Load the worksheet as a (rows, width) uint8 array.
+
+    When every line has the same length the array is a view straight
+    over the file bytes; otherwise short lines are padded with spaces.
+    """
+    with open(filepath, 'rb') as f:
+        data = np.frombuffer(f.read(), dtype=np.uint8)
+    if data.size and data[-1] != ord('\n'):
+        data = np.append(data, np.uint8(ord('\n')))
+    ends = np.flatnonzero(data == ord('\n'))
+    starts = np.zeros_like(ends)
+    starts[1:] = ends[:-1] + 1
+    lengths = ends - starts
+    width = int(lengths.max(initial=0))
+    if np.all(lengths == width):
+        return data.reshape(len(ends), width + 1)[:, :width]
+    sheet = np.full((len(ends), width), SPACE, dtype=np.uint8)
+    for row, (start, end) in enumerate(zip(starts, ends)):
+        sheet[row, :end - start] = data[start:end]
+    return sheet
+
+
+def decode_column(digit_rows, is_digit, col):
+    """Decode one column's vertical number with Python ints."""
+    return int(digit_rows[is_digit[:, col], col].tobytes())
+
+
+def decode_columns(sheet):
+    """Decode every column of a worksheet block at once.
+
+    Returns:
+        (values, has_number, separator): each column's vertical number,
+        whether it has any digits, and whether it is all spaces.
+    """
+    digit_rows = sheet[:-1]
+    is_digit = (digit_rows >= ord('0')) & (digit_rows <= ord('9'))
+    separator = np.all(sheet == SPACE, axis=0)
+    has_number = is_digit.any(axis=0)
+    if is_digit.sum(axis=0).max(initial=0) > INT64_DIGITS:
+        # Columns too tall for int64 decode with Python ints instead.
+        values = np.zeros(sheet.shape[1], dtype=object)
+        for col in np.flatnonzero(has_number):
+            values[col] = decode_column(digit_rows, is_digit, col)
+        return values, has_number, separator
+    digits_below = np.cumsum(is_digit[::-1], axis=0)[::-1] - is_digit
+    weights = np.where(is_digit, 10 ** digits_below.astype(np.int64), 0)
+    digit_values = digit_rows.astype(np.int64) - ord('0')
+    values = (digit_values * weights).sum(axis=0)
+    return values, has_number, separator
+
+
+def calculate_worksheet(sheet):
+    """Calculate the worksheet total with whole-array operations.
+
+    Each column's vertical number is the sum of its digits weighted by
+    10 to the number of digits below them, and problems are the runs
+    of columns between all-space separator columns.
+    """
+    op_row = sheet[-1]
+    values, has_number, separator = decode_columns(sheet)
+
+    # Problem id of every column; separators bump it.
+    problem = np.cumsum(separator)
+    number_cols = np.flatnonzero(has_number)
+    op_cols = np.flatnonzero((op_row == ord('+')) | (op_row == ord('*')))
+    if not number_cols.size or not op_cols.size:
+        return 0
+    number_problem = problem[number_cols]
+    values = values[number_cols]
+    group_starts = np.flatnonzero(
+        np.diff(number_problem, prepend=-1) != 0
+    )
+    group_ends = np.append(group_starts[1:], len(values))
+    group_problem = number_problem[group_starts]
+
+    # The leftmost operator of a problem wins, like the right to left scan.
+    op_problem, first = np.unique(problem[op_cols], return_index=True)
+    found = np.minimum(np.searchsorted(op_problem, group_problem),
+                       len(op_problem) - 1)
+    group_ops = np.where(op_problem[found] == group_problem,
+                         op_row[op_cols[first]][found], 0)
+
+    # Estimate each sum's size to find the ones int64 holds.
+    estimates = values.astype(np.float64)
+    is_add = group_ops == ord('+')
+    small_sums = np.add.reduceat(estimates, group_starts) < INT64_MAX / 2
+    sums = np.add.reduceat(values, group_starts)
+    total = sum(sums[is_add & small_sums].tolist())
+    # Big sums redo the add with Python ints.
+    for group in np.flatnonzero(is_add & ~small_sums):
+        start, end = group_starts[group], group_ends[group]
+        total += sum(values[start:end].tolist())
+
+    # Estimate each product's digit count to find the ones int64 holds.
+    digits = np.add.reduceat(np.log10(np.maximum(estimates, 1)) + 1,
+                             group_starts)
+    is_mul = group_ops == ord('*')
+    products = np.multiply.reduceat(values, group_starts)
+    total += sum(products[is_mul & (digits < INT64_DIGITS)].tolist())
+    # Big products redo the multiply with Python ints.
+    for group in np.flatnonzero(is_mul & (digits >= INT64_DIGITS)):
+        start, end = group_starts[group], group_ends[group]
+        total += math.prod(values[start:end].tolist())
     return total
 
 
+def gen_row_spans(mm):
+    """Generate the (start, end) byte offsets of every line."""
+    start = 0
+    while start < len(mm):
+        end = mm.find(b'\n', start)
+        if end == -1:
+            end = len(mm)
+        yield start, end
+        start = end + 1
+
+
+def read_column_block(mm, spans, block_start, block_end):
+    """Read columns [block_start, block_end) of every row, space padded."""
+    block = np.full((len(spans), block_end - block_start), SPACE,
+                    dtype=np.uint8)
+    for row, (start, end) in enumerate(spans):
+        chunk = mm[start + block_start:min(end, start + block_end)]
+        block[row, :len(chunk)] = np.frombuffer(chunk, dtype=np.uint8)
+    return block
+
+
+def gen_running_totals(filepath, block_size=BLOCK_SIZE):
+    """Generate the running total as each problem completes.
+
+    Columns are read right to left through mmap one block at a time,
+    and a problem is evaluated as soon as its separator column shows
+    up, so memory holds one block plus the problem in progress. Each
+    column decodes with Python ints, so tall columns stay exact.
+    """
+    total = 0
+    cur_nums = []
+    cur_op = None
+    with open(filepath, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            spans = list(gen_row_spans(mm))
+            width = max((end - start for start, end in spans), default=0)
+            for block_end in range(width, 0, -block_size):
+                block_start = max(0, block_end - block_size)
+                block = read_column_block(mm, spans, block_start, block_end)
+                digit_rows = block[:-1]
+                is_digit = ((digit_rows >= ord('0'))
+                            & (digit_rows <= ord('9')))
+                has_number = is_digit.any(axis=0)
+                separator = np.all(block == SPACE, axis=0)
+                ops = block[-1].tobytes().decode()
+                for col in reversed(range(block_end - block_start)):
+                    if separator[col]:
+                        if cur_nums and cur_op:
+                            total += evaluate_problem(cur_op, cur_nums)
+                            yield total
+                        cur_nums = []
+                        cur_op = None
+                        continue
+                    if has_number[col]:
+                        cur_nums.append(
+                            decode_column(digit_rows, is_digit, col))
+                    if ops[col] in ('+', '*'):
+                        cur_op = ops[col]
+    if cur_nums and cur_op:
+        total += evaluate_problem(cur_op, cur_nums)
+        yield total
+
+
 def main():
     """Run the main body of the script."""
-    # lines = get_input("p6-sample-input.txt")
-    lines = get_input("p6-full-input.txt")
-    cols = get_columns(lines)
-    results = calculate_columns(cols)
+    # sheet = load_worksheet("p6-sample-input.txt")
+    sheet = load_worksheet("p6-full-input.txt")
+    results = calculate_worksheet(sheet)
     print(f"{results=}")
 
 
@@ -1,4 +1,6 @@
 """Advent of Code 2025 Day 6 part 2."""
+import bisect
+from collections import deque
 
 
 def get_input(filepath):
@@ -9,6 +11,13 @@ def get_input(filepath):
     return lines
 
 
+def gen_lines(filepath):
+    """Generate the input one line at a time."""
+    with open(filepath, 'r') as f:
+        for line in f:
+            yield line.rstrip('\n')
+
+
 def build_grid(lines):
     """Build the grid from lines of text."""
     grid = []
@@ -111,18 +120,129 @@ def solve_part2(lines):
     return count_paths(start_pos[0] + 1, start_pos[1])
 
 
+def sweep_beams(lines):
+    """Solve both parts in one top to bottom sweep over the rows.
+
+    Keeps the number of timelines with a beam in each column. A row's
+    splitters move their column's count to the columns on either side;
+    counts that leave the sides end as finished timelines.
+
+    Returns:
+        (activated_splitters_count, total_timelines)
+    """
+    lines = iter(lines)
+    for line in lines:
+        start_col = line.find('S')
+        if start_col != -1:
+            break
+    else:
+        return 0, 0
+    cols = len(line)
+    counts = [0] * cols
+    counts[start_col] = 1
+    activated = 0
+    finished = 0
+    for line in lines:
+        if len(line) > cols:
+            counts.extend([0] * (len(line) - cols))
+            cols = len(line)
+        next_counts = counts[:]
+        col = line.find('^')
+        while col != -1:
+            beams = counts[col]
+            if beams:
+                activated += 1
+                next_counts[col] -= beams
+                for side in (col - 1, col + 1):
+                    if 0 <= side < cols:
+                        next_counts[side] += beams
+                    else:
+                        finished += beams
+            col = line.find('^', col + 1)
+        counts = next_counts
+    return activated, finished + sum(counts)
+
+
+def build_splitter_index(lines):
+    """Index the splitter rows of every column in one scan.
+
+    Returns:
+        (start_pos, column_rows): where S is, and for each column the
+        sorted rows that hold a splitter.
+    """
+    start_pos = None
+    column_rows = []
+    for r, line in enumerate(lines):
+        if len(line) > len(column_rows):
+            column_rows.extend([] for _ in range(len(line) - len(column_rows)))
+        if start_pos is None and 'S' in line:
+            start_pos = (r, line.index('S'))
+        col = line.find('^')
+        while col != -1:
+            column_rows[col].append(r)
+            col = line.find('^', col + 1)
+    return start_pos, column_rows
+
+
+def find_next_splitter(column_rows, r, c):
+    """Get the first splitter row at or below r in column c, or None."""
+    if not 0 <= c < len(column_rows):
+        return None
+    rows = column_rows[c]
+    pos = bisect.bisect_left(rows, r)
+    return rows[pos] if pos < len(rows) else None
+
+
+def count_activated(index):
+    """Find number of activated splitters by jumping between them."""
+    start_pos, column_rows = index
+    if start_pos is None:
+        raise ValueError("No start column found!")
+    queue = deque([(start_pos[0] + 1, start_pos[1])])
+    activated_splitters = set()
+    while queue:
+        r, c = queue.popleft()
+        hit = find_next_splitter(column_rows, r, c)
+        if hit is not None and (hit, c) not in activated_splitters:
+            activated_splitters.add((hit, c))
+            queue.append((hit + 1, c - 1))
+            queue.append((hit + 1, c + 1))
+    return len(activated_splitters)
+
+
+def count_timelines(index):
+    """Count the timelines by solving splitters from the bottom up."""
+    start_pos, column_rows = index
+    if start_pos is None:
+        return 0
+    splitters = sorted(
+        ((r, c) for c, rows in enumerate(column_rows) for r in rows),
+        reverse=True,
+    )
+    # Timelines resulting from each splitter.
+    memo = {}
+
+    def beam_timelines(r, c):
+        hit = find_next_splitter(column_rows, r, c)
+        return 1 if hit is None else memo[(hit, c)]
+
+    # Splitters below are always solved before the ones above.
+    for r, c in splitters:
+        memo[(r, c)] = (beam_timelines(r + 1, c - 1)
+                        + beam_timelines(r + 1, c + 1))
+    return beam_timelines(start_pos[0] + 1, start_pos[1])
+
+
 def main():
     """Run the main body of the script."""
-    # lines = list(get_input("p7-sample-input.txt"))
-    lines = list(get_input("p7-full-input.txt"))
-    grid = build_grid(lines)
-    # print(f"{lines=}")
-    # print(f"{grid=}")
-    activated_splitters_count = solve_part1(grid)
+    # filepath = "p7-sample-input.txt"
+    filepath = "p7-full-input.txt"
+    activated_splitters_count, total_timelines = sweep_beams(
+        gen_lines(filepath)
+    )
     print("Part 1:")
     print(f"\t{activated_splitters_count=}")
     print("Part 2:")
-    total_timelines = solve_part2(lines)
     print(f"\t{total_timelines=}")
 
 
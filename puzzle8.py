@@ -1,6 +1,20 @@
 """Advent of Code 2025 Day 8."""
+import functools
+import heapq
 import itertools
 import math
+import sys
+import time
+from array import array
+from collections import defaultdict
+
+import numpy as np
+
+
+# Rough cap on pair entries held per distance block.
+BLOCK_SIZE = 1 << 20
+# union_many finishes with scalar unions below this many edges.
+MIN_UNION_BATCH = 64
 
 
 class UnionFind:
@@ -8,17 +22,21 @@ class UnionFind:
 
     def __init__(self, total_nodes):
         """Initialize a UnionFind."""
-        self.parent = list(range(total_nodes))
-        self.size = [1] * total_nodes
+        self.parent = array('l', range(total_nodes))
+        self.size = array('l', [1]) * total_nodes
         self.num_components = total_nodes
+        # NumPy views sharing the arrays' memory, for batched unions.
+        self.parent_view = np.frombuffer(self.parent, dtype='l')
+        self.size_view = np.frombuffer(self.size, dtype='l')
 
     def find(self, node_id):
-        """Find the root representative of node with Path Compression."""
-        if self.parent[node_id] != node_id:
-            # Recursively find the root and point node directly to it.
-            # This flattens the tree, making lookups O(1).
-            self.parent[node_id] = self.find(self.parent[node_id])
-        return self.parent[node_id]
+        """Find the root representative of node with path halving."""
+        parent = self.parent
+        while parent[node_id] != node_id:
+            # Point the node at its grandparent, halving the path.
+            parent[node_id] = parent[parent[node_id]]
+            node_id = parent[node_id]
+        return node_id
 
     def union(self, node_a, node_b):
         """Unite circuits containing node_a and node_b.
@@ -32,7 +50,9 @@ class UnionFind:
         root_a = self.find(node_a)
         root_b = self.find(node_b)
         if root_a != root_b:
-            # Merge circuit b into circuit a.
+            # Merge the smaller circuit into the bigger one.
+            if self.size[root_a] < self.size[root_b]:
+                root_a, root_b = root_b, root_a
             self.parent[root_b] = root_a
             # Add the size of the absorbed circuit to the new root.
             self.size[root_a] += self.size[root_b]
@@ -40,6 +60,101 @@ class UnionFind:
             return True
         return False
 
+    def find_all(self, nodes):
+        """Find the roots of many nodes at once with path halving.
+
+        Every round points each node on the way at its grandparent, so
+        the rounds are bounded by the tree depth, which union by size
+        keeps logarithmic.
+        """
+        parent = self.parent_view
+        current = np.asarray(nodes)
+        while True:
+            parents = parent[current]
+            grandparents = parent[parents]
+            if np.array_equal(parents, grandparents):
+                break
+            parent[current] = grandparents
+            current = grandparents
+        roots = parent[current]
+        parent[nodes] = roots
+        return roots
+
+    def jump_to_roots(self, nodes):
+        """Point every node straight at its root by pointer jumping.
+
+        All of nodes jump together, so a chain of hooked roots of
+        length k settles in O(log k) rounds.
+        """
+        parent = self.parent_view
+        while True:
+            parents = parent[nodes]
+            grandparents = parent[parents]
+            if np.array_equal(parents, grandparents):
+                return
+            parent[nodes] = grandparents
+
+    def union_batch(self, nodes_a, nodes_b):
+        """Unite the circuits of every node pair with array operations.
+
+        Each round hooks the smaller root of every pair under the bigger
+        one, ordered by (size, id) so hooks never form a cycle, then
+        pointer jumps the hooked roots and updates the sizes. The batch
+        costs a few whole-array passes instead of a Python loop per edge.
+        """
+        parent = self.parent_view
+        size = self.size_view
+        roots_a = self.find_all(nodes_a)
+        roots_b = self.find_all(nodes_b)
+        while True:
+            cross = roots_a != roots_b
+            roots_a, roots_b = roots_a[cross], roots_b[cross]
+            if not roots_a.size:
+                return
+            size_a, size_b = size[roots_a], size[roots_b]
+            a_smaller = (size_a < size_b) | ((size_a == size_b)
+                                             & (roots_a < roots_b))
+            low = np.where(a_smaller, roots_a, roots_b)
+            # Any bigger partner will do when a root has several.
+            parent[low] = np.where(a_smaller, roots_b, roots_a)
+            # Every hooked root is one merge; sort to drop repeats.
+            hooked = np.sort(low)
+            hooked = hooked[np.diff(hooked, prepend=-1) != 0]
+            self.jump_to_roots(hooked)
+            np.add.at(size, parent[hooked], size[hooked])
+            self.num_components -= hooked.size
+            # Roots from the start of the round are at most one hop away.
+            roots_a = parent[roots_a]
+            roots_b = parent[roots_b]
+
+    def union_many(self, edges):
+        """Unite the circuits of each edge in order.
+
+        Args:
+            edges: Edges whose last two items are the nodes, like
+                (node_a, node_b) or (distance, node_a, node_b), as a
+                sequence or an array with one edge per row.
+        Returns:
+            The index of the edge that left one circuit, or None.
+        """
+        edges = np.asarray(edges)
+        if not edges.size:
+            return None
+        nodes_a = edges[:, -2].astype(np.intp)
+        nodes_b = edges[:, -1].astype(np.intp)
+        start = 0
+        # Each edge merges at most two circuits, so a batch shorter than
+        # the merges still needed can't be the one that leaves one.
+        while (stop := min(len(edges), start + self.num_components - 2)
+               ) - start >= MIN_UNION_BATCH:
+            self.union_batch(nodes_a[start:stop], nodes_b[start:stop])
+            start = stop
+        for idx in range(start, len(edges)):
+            merged = self.union(int(nodes_a[idx]), int(nodes_b[idx]))
+            if merged and self.num_components == 1:
+                return idx
+        return None
+
 
 def gen_input(filepath):
     """Generate the input."""
@@ -70,18 +185,246 @@ def gen_distances(combinations):
         yield (distance, i, j)
 
 
+def build_cell_grid(nodes):
+    """Bucket nodes into cubic cells that hold about two nodes each.
+
+    Returns:
+        (cell_size, cells, extent): the cell edge length, a dict from
+        cell key to node ids, and the widest span of the grid in cells.
+    """
+    lows = [min(axis) for axis in zip(*nodes)]
+    highs = [max(axis) for axis in zip(*nodes)]
+    volume = math.prod(max(high - low, 1) for low, high in zip(lows, highs))
+    cell_size = max(1, round((2 * volume / len(nodes)) ** (1 / 3)))
+    cells = defaultdict(list)
+    for node_id, node in enumerate(nodes):
+        cells[tuple(v // cell_size for v in node)].append(node_id)
+    extent = max(
+        high // cell_size - low // cell_size
+        for low, high in zip(lows, highs)
+    )
+    return cell_size, cells, extent
+
+
+@functools.cache
+def get_shell(radius):
+    """Get the cell offsets exactly radius cells away (Chebyshev)."""
+    span = range(-radius, radius + 1)
+    return tuple(
+        offset for offset in itertools.product(span, repeat=3)
+        if max(map(abs, offset)) == radius
+    )
+
+
+def find_nearest(nodes, grid, node_id, k):
+    """Get the k nearest (distance_sq, neighbor) pairs of a node.
+
+    Scans shells of cells outward and stops once nothing in an
+    unscanned cell can beat the current k-th best.
+    """
+    cell_size, cells, extent = grid
+    node = nodes[node_id]
+    home = tuple(v // cell_size for v in node)
+    # Max-heap of the best k, stored negated.
+    best = []
+    for radius in range(extent + 1):
+        for offset in get_shell(radius):
+            key = tuple(h + d for h, d in zip(home, offset))
+            for other in cells.get(key, ()):
+                if other == node_id:
+                    continue
+                distance_sq = sum(
+                    (a - b)**2 for a, b in zip(node, nodes[other])
+                )
+                item = (-distance_sq, -other)
+                if len(best) < k:
+                    heapq.heappush(best, item)
+                elif item > best[0]:
+                    heapq.heapreplace(best, item)
+        # Unscanned cells are more than radius * cell_size away.
+        if len(best) == k and -best[0][0] <= (radius * cell_size)**2:
+            break
+    return sorted((-d, -other) for d, other in best)
+
+
+def gen_nearest_edges(nodes, k=8):
+    """Generate (distance_sq, i, j) edges in increasing distance order.
+
+    Candidate edges come from each node's nearest neighbors. An edge
+    left out is at least as long as the k-th neighbor distance of both
+    its ends, so every candidate shorter than the second smallest k-th
+    distance is safe to emit. Past that, the nodes holding the bound
+    back double their k and add the next band of candidates.
+    """
+    num_nodes = len(nodes)
+    if num_nodes < 2:
+        return
+    grid = build_cell_grid(nodes)
+    node_k = [0] * num_nodes
+    version = [0] * num_nodes
+    # (kth distance, node, version); entries with an old version are stale.
+    kth_heap = [(0, i, 0) for i in range(num_nodes)]
+    pending = []
+    pending_pairs = set()
+    while True:
+        # Pop every live node tied at or below the second smallest bound.
+        growing = []
+        while kth_heap:
+            distance_sq, i, seen = kth_heap[0]
+            if seen != version[i]:
+                heapq.heappop(kth_heap)
+            elif len(growing) < 2 or distance_sq <= growing[-1][0]:
+                growing.append(heapq.heappop(kth_heap))
+            else:
+                break
+        safe_below = growing[1][0] if len(growing) >= 2 else math.inf
+        while pending and pending[0][0] < safe_below:
+            edge = heapq.heappop(pending)
+            pending_pairs.discard(edge[1:])
+            yield edge
+        if safe_below == math.inf:
+            return
+        for _, i, _ in growing:
+            node_k[i] = min(max(k, 2 * node_k[i]), num_nodes - 1)
+            nearest = find_nearest(nodes, grid, i, node_k[i])
+            for distance_sq, j in nearest:
+                pair = (min(i, j), max(i, j))
+                # Anything shorter than safe_below went out already.
+                if distance_sq >= safe_below and pair not in pending_pairs:
+                    pending_pairs.add(pair)
+                    heapq.heappush(pending, (distance_sq, *pair))
+            version[i] += 1
+            # Nodes that know all their neighbors no longer bound anything.
+            if node_k[i] < num_nodes - 1:
+                heapq.heappush(kth_heap, (nearest[-1][0], i, version[i]))
+
+
+def gen_distance_blocks(coords, block_size=BLOCK_SIZE):
+    """Generate condensed upper-triangle squared distances in row blocks.
+
+    Args:
+        coords: An (n, 3) int64 array of node coordinates.
+        block_size: Rough cap on the pairs computed per block.
+    Yields:
+        (distance_sq, i, j) arrays for the pairs i < j of a row block.
+    """
+    num_nodes = len(coords)
+    start = 0
+    while start < num_nodes - 1:
+        width = num_nodes - start
+        stop = min(num_nodes, start + max(1, block_size // width))
+        rows = np.arange(start, stop)
+        cols = np.arange(start, num_nodes)
+        deltas = coords[start:stop, np.newaxis, :] - coords[np.newaxis, start:]
+        distance_sq = np.einsum('ijk,ijk->ij', deltas, deltas)
+        upper = cols[np.newaxis, :] > rows[:, np.newaxis]
+        i, j = np.nonzero(upper)
+        yield distance_sq[upper], rows[i], cols[j]
+        start = stop
+
+
+def select_shortest(edges, budget):
+    """Keep the budget shortest edges, plus any tied with the longest.
+
+    Keeping ties whole means the kept edges are always a prefix of the
+    fully sorted edge order.
+    """
+    distance_sq, i, j = edges
+    if len(distance_sq) <= budget:
+        return edges
+    order = np.argpartition(distance_sq, budget - 1)
+    boundary = distance_sq[order[budget - 1]]
+    keep = distance_sq <= boundary
+    return distance_sq[keep], i[keep], j[keep]
+
+
+def sort_edges(edges):
+    """Sort edge arrays by (distance_sq, i, j)."""
+    distance_sq, i, j = edges
+    order = np.lexsort((j, i, distance_sq))
+    return distance_sq[order], i[order], j[order]
+
+
+def get_next_edges(coords, after, budget, block_size=BLOCK_SIZE):
+    """Get the next sorted band of edges coming after an edge.
+
+    Args:
+        coords: An (n, 3) int64 array of node coordinates.
+        after: The last (distance_sq, i, j) already used, or None.
+        budget: How many edges the band should hold.
+        block_size: Rough cap on the pairs computed per block.
+    """
+    empty = np.empty(0, dtype=np.int64)
+    kept = (empty, empty, empty)
+    for distance_sq, i, j in gen_distance_blocks(coords, block_size):
+        if after is not None:
+            last_d, last_i, last_j = after
+            later = (distance_sq > last_d) | (
+                (distance_sq == last_d)
+                & ((i > last_i) | ((i == last_i) & (j > last_j)))
+            )
+            distance_sq, i, j = distance_sq[later], i[later], j[later]
+        kept = select_shortest(
+            tuple(map(np.concatenate, zip(kept, (distance_sq, i, j)))),
+            budget,
+        )
+    return sort_edges(kept)
+
+
+def get_shortest_edges(coords, limit, block_size=BLOCK_SIZE):
+    """Get the limit shortest (distance_sq, i, j) edges for part 1."""
+    distance_sq, i, j = get_next_edges(coords, None, limit, block_size)
+    return list(zip(distance_sq[:limit].tolist(), i[:limit].tolist(),
+                    j[:limit].tolist()))
+
+
+def gen_sorted_edges(coords, block_size=BLOCK_SIZE):
+    """Generate every (distance_sq, i, j) edge in sorted order.
+
+    Each pass rescans the distance blocks for the next band of about
+    block_size edges, so memory stays bounded by the block size.
+    """
+    after = None
+    while True:
+        band = get_next_edges(coords, after, block_size, block_size)
+        if not len(band[0]):
+            return
+        edges = zip(*(column.tolist() for column in band))
+        yield from edges
+        after = tuple(int(column[-1]) for column in band)
+
+
+def benchmark(num_nodes=1_000_000, num_edges=3_000_000, seed=0):
+    """Time UnionFind.union_many on random edges and on a chain."""
+    rng = np.random.default_rng(seed)
+    chain = np.arange(num_nodes - 1)
+    cases = {
+        "random": rng.integers(num_nodes, size=(num_edges, 2)),
+        # Sorted edges along a path, like Kruskal order on a line.
+        "chain": np.column_stack((chain, chain + 1)),
+    }
+    for name, edges in cases.items():
+        uf = UnionFind(num_nodes)
+        t0 = time.perf_counter()
+        uf.union_many(edges)
+        elapsed = time.perf_counter() - t0
+        print(f"{name}: {len(edges)} unions over {num_nodes} nodes:")
+        print(f"\t{elapsed:.3f}s, {len(edges) / elapsed:,.0f} unions/s")
+
+
 def main():
     """Run the main body of the script."""
     input_file = "p8-full-input.txt"
     print("Part 1:")
     nodes = list(gen_nodes(gen_input(input_file)))
-    sorted_edges = sorted(gen_distances(gen_combinations(nodes)))
     uf = UnionFind(len(nodes))
     if input_file == "p8-sample-input.txt":
         limit = 10
     else:
         limit = 1000
-    for _, u, v in sorted_edges[:limit]:
+    edges = gen_nearest_edges(nodes)
+    first_edges = list(itertools.islice(edges, limit))
+    for _, u, v in first_edges:
         uf.union(u, v)
     # Filter the root nodes to get valid circuit sizes.
     circuit_sizes = [
@@ -99,15 +442,20 @@ def main():
         print("Not enough circuits formed!")
     print("Part 2:")
     uf = UnionFind(len(nodes))
-    for _, u, v in sorted_edges:
-        if uf.union(u, v):
-            if uf.num_components == 1:
-                print(f"\tGraph fully connected by connecting {u} and {v}")
-                x1 = nodes[u][0]
-                x2 = nodes[v][0]
-                print(f"\tAnser: {x1 * x2}")
-                break
-    
+    all_edges = itertools.chain(first_edges, edges)
+    while batch := list(itertools.islice(all_edges, 4096)):
+        last = uf.union_many(batch)
+        if last is not None:
+            _, u, v = batch[last]
+            print(f"\tGraph fully connected by connecting {u} and {v}")
+            x1 = nodes[u][0]
+            x2 = nodes[v][0]
+            print(f"\tAnser: {x1 * x2}")
+            break
+
 
 if __name__ == "__main__":
-    main()
+    if "--bench" in sys.argv[1:]:
+        benchmark()
+    else:
+        main()
@@ -1,6 +1,16 @@
 """Advent of Code 2025 Day 9."""
+import bisect
+import heapq
 import itertools
 
+import numpy as np
+
+
+# Rows of the pairwise area matrix computed at once.
+BLOCK_ROWS = 1024
+# Partners a vertex's cursor sorts at once.
+PARTNER_BATCH = 256
+
 
 def get_input(filepath):
     """Generate the input."""
@@ -30,6 +40,57 @@ def get_areas(coords):
     return areas
 
 
+def get_vertex_arrays(coords):
+    """Get the vertices' x and y coordinates as int64 arrays."""
+    px = np.array([x for x, _ in coords], dtype=np.int64)
+    py = np.array([y for _, y in coords], dtype=np.int64)
+    return px, py
+
+
+def get_area_bounds(px, py):
+    """Get the largest area a rectangle with a corner at each vertex has."""
+    return ((np.maximum(px - px.min(), px.max() - px) + 1)
+            * (np.maximum(py - py.min(), py.max() - py) + 1))
+
+
+def get_max_area(coords, block_rows=BLOCK_ROWS):
+    """Get the largest area for all coordinates, one row block at a time."""
+    px, py = get_vertex_arrays(coords)
+    best = 0
+    for start in range(0, len(coords), block_rows):
+        stop = start + block_rows
+        areas = ((np.abs(px[start:stop, np.newaxis] - px) + 1)
+                 * (np.abs(py[start:stop, np.newaxis] - py) + 1))
+        best = max(best, int(areas.max()))
+    return best
+
+
+def get_top_areas(coords, k, block_rows=BLOCK_ROWS):
+    """Get the k largest (area, i, j) for all coordinates, largest first."""
+    if k <= 0:
+        return []
+    px, py = get_vertex_arrays(coords)
+    empty = np.empty(0, dtype=np.int64)
+    top_areas, top_i, top_j = empty, empty, empty
+    for start in range(0, len(coords), block_rows):
+        stop = start + block_rows
+        areas = ((np.abs(px[start:stop, np.newaxis] - px) + 1)
+                 * (np.abs(py[start:stop, np.newaxis] - py) + 1))
+        rows = np.arange(start, min(stop, len(coords)))
+        upper = np.arange(len(coords)) > rows[:, np.newaxis]
+        block_i, block_j = np.nonzero(upper)
+        top_areas = np.concatenate((top_areas, areas[upper]))
+        top_i = np.concatenate((top_i, block_i + start))
+        top_j = np.concatenate((top_j, block_j))
+        if len(top_areas) > k:
+            keep = np.argpartition(-top_areas, k - 1)[:k]
+            top_areas = top_areas[keep]
+            top_i, top_j = top_i[keep], top_j[keep]
+    order = np.lexsort((top_j, top_i, -top_areas))
+    return list(zip(top_areas[order].tolist(), top_i[order].tolist(),
+                    top_j[order].tolist()))
+
+
 def is_center_inside(min_x, max_x, min_y, max_y, edges):
     """Return true if the center of the rectangle is inside the polygon."""
     cx = (min_x + max_x) / 2
@@ -75,16 +136,115 @@ def hits_any_wall(min_x, max_x, min_y, max_y, edges):
     return False
 
 
+class IntervalTree:
+    """Centered interval tree of half-open [lo, hi) intervals."""
+
+    def __init__(self, intervals):
+        """Initialize an IntervalTree from (lo, hi, payload) tuples."""
+        self.center = None
+        self.left = None
+        self.right = None
+        if not intervals:
+            return
+        # The median start always lands in at least one interval.
+        starts = sorted(lo for lo, _, _ in intervals)
+        self.center = starts[len(starts) // 2]
+        here = [iv for iv in intervals if iv[0] <= self.center < iv[1]]
+        left = [iv for iv in intervals if iv[1] <= self.center]
+        right = [iv for iv in intervals if iv[0] > self.center]
+        # Intervals at this node, by lo rising and by hi falling.
+        self.by_lo = sorted(here, key=lambda iv: iv[0])
+        self.by_hi = sorted(here, key=lambda iv: iv[1], reverse=True)
+        if left:
+            self.left = IntervalTree(left)
+        if right:
+            self.right = IntervalTree(right)
+
+    def gen_stabbed(self, point):
+        """Generate the intervals with lo <= point < hi."""
+        node = self
+        while node is not None and node.center is not None:
+            if point < node.center:
+                for iv in node.by_lo:
+                    if iv[0] > point:
+                        break
+                    yield iv
+                node = node.left
+            else:
+                for iv in node.by_hi:
+                    if iv[1] <= point:
+                        break
+                    yield iv
+                node = node.right
+
+
+class PolygonIndex:
+    """Polygon walls indexed for fast containment queries.
+
+    Vertical walls sit in an interval tree on their y span for ray
+    casting, and both wall directions are kept sorted on their fixed
+    coordinate for the wall intersection test.
+    """
+
+    def __init__(self, coords):
+        """Initialize a PolygonIndex from the polygon's vertices."""
+        vertical = []
+        horizontal = []
+        for (x1, y1), (x2, y2) in build_edges(coords):
+            if x1 == x2:
+                vertical.append((x1, min(y1, y2), max(y1, y2)))
+            elif y1 == y2:
+                horizontal.append((y1, min(x1, x2), max(x1, x2)))
+        vertical.sort()
+        horizontal.sort()
+        self.vertical = vertical
+        self.vertical_keys = [wall[0] for wall in vertical]
+        self.horizontal = horizontal
+        self.horizontal_keys = [wall[0] for wall in horizontal]
+        self.y_spans = IntervalTree(
+            [(lo, hi, x) for x, lo, hi in vertical if lo < hi]
+        )
+
+    def is_center_inside(self, min_x, max_x, min_y, max_y):
+        """Return true if the center of the rectangle is inside."""
+        cx = (min_x + max_x) / 2
+        cy = (min_y + max_y) / 2
+        crossings = sum(
+            1 for _, _, x in self.y_spans.gen_stabbed(cy) if x > cx
+        )
+        return crossings % 2 == 1
+
+    def hits_any_wall(self, min_x, max_x, min_y, max_y):
+        """Return true if a wall intersects the interior of the rectangle."""
+        for walls, keys, lo, hi, cross_lo, cross_hi in (
+            (self.vertical, self.vertical_keys, min_x, max_x, min_y, max_y),
+            (self.horizontal, self.horizontal_keys, min_y, max_y,
+             min_x, max_x),
+        ):
+            # Walls strictly inside the rectangle's span.
+            start = bisect.bisect_right(keys, lo)
+            stop = bisect.bisect_left(keys, hi)
+            for _, wall_lo, wall_hi in walls[start:stop]:
+                if max(wall_lo, cross_lo) < min(wall_hi, cross_hi):
+                    return True
+        return False
+
+    def contains_rect(self, min_x, max_x, min_y, max_y):
+        """Return true if the rectangle lies inside the polygon."""
+        return (self.is_center_inside(min_x, max_x, min_y, max_y)
+                and not self.hits_any_wall(min_x, max_x, min_y, max_y))
+
+
 def get_areas2(coords):
     """Get areas of squares inside walls."""
-    edges = build_edges(coords)
+    index = PolygonIndex(coords)
     areas = []
     for (x1, y1), (x2, y2) in itertools.combinations(coords, 2):
         # Define rectangle boundaries.
         min_x, max_x = min(x1, x2), max(x1, x2)
         min_y, max_y = min(y1, y2), max(y1, y2)
-        if is_center_inside(min_x, max_x, min_y, max_y, edges):
-            if not hits_any_wall(min_x, max_x, min_y, max_y, edges):
+        if index.is_center_inside(min_x, max_x, min_y, max_y):
+            if not index.hits_any_wall(min_x, max_x, min_y, max_y):
                 width = (max_x - min_x) + 1
                 height = (max_y - min_y) + 1
                 areas.append(width * height)
@@ -103,18 +263,139 @@ def build_edges(coords):
     return edges
 
 
+def build_inside_grid(coords):
+    """Rasterize the polygon on its compressed coordinates.
+
+    Cell (i, j) is the open box between xs[i]..xs[i + 1] and
+    ys[j]..ys[j + 1]. It is inside when an odd number of vertical walls
+    lie to its left across its y band.
+
+    Returns:
+        (xs, ys, prefix): sorted unique coordinates and a 2-D prefix
+        sum of inside cells, so prefix[i, j] counts cells below (i, j).
+    """
+    xs = np.unique([x for x, _ in coords])
+    ys = np.unique([y for _, y in coords])
+    toggles = np.zeros((len(xs), len(ys)), dtype=np.uint8)
+    for (x1, y1), (x2, y2) in build_edges(coords):
+        if x1 == x2:
+            col = np.searchsorted(xs, x1)
+            lo, hi = np.searchsorted(ys, sorted((y1, y2)))
+            toggles[col, lo:hi] ^= 1
+    inside = np.bitwise_xor.accumulate(toggles, axis=0)[:-1, :-1]
+    prefix = np.zeros((len(xs), len(ys)), dtype=np.int64)
+    prefix[1:, 1:] = inside.cumsum(axis=0).cumsum(axis=1)
+    return xs, ys, prefix
+
+
+def count_inside_cells(prefix, x_lo, x_hi, y_lo, y_hi):
+    """Count inside cells in compressed box [x_lo, x_hi) x [y_lo, y_hi)."""
+    return (prefix[x_hi, y_hi] - prefix[x_lo, y_hi]
+            - prefix[x_hi, y_lo] + prefix[x_lo, y_lo])
+
+
+def is_rect_inside(grid, edges, x1, y1, x2, y2):
+    """Check a rectangle with corners on polygon coordinates is inside."""
+    xs, ys, prefix = grid
+    min_x, max_x = min(x1, x2), max(x1, x2)
+    min_y, max_y = min(y1, y2), max(y1, y2)
+    x_lo = bisect.bisect_left(xs, min_x)
+    x_hi = bisect.bisect_left(xs, max_x)
+    y_lo = bisect.bisect_left(ys, min_y)
+    y_hi = bisect.bisect_left(ys, max_y)
+    if x_lo == x_hi or y_lo == y_hi:
+        # Flat rectangles have no cells; fall back to the ray cast.
+        return is_center_inside(min_x, max_x, min_y, max_y, edges)
+    cells = (x_hi - x_lo) * (y_hi - y_lo)
+    return count_inside_cells(prefix, x_lo, x_hi, y_lo, y_hi) == cells
+
+
+def gen_partners(px, py, rank, i, batch=PARTNER_BATCH):
+    """Generate (area, j) for vertices ranked after i, largest first.
+
+    A lazy cursor: each batch recomputes the areas and sorts only the
+    next batch of partners, so it never holds more than one batch.
+    """
+    last_area, last_j = None, -1
+    while True:
+        others = np.flatnonzero(rank > rank[i])
+        areas = ((np.abs(px[others] - px[i]) + 1)
+                 * (np.abs(py[others] - py[i]) + 1))
+        if last_area is not None:
+            # Skip the partners earlier batches already gave out.
+            after = ((areas < last_area)
+                     | ((areas == last_area) & (others > last_j)))
+            others, areas = others[after], areas[after]
+        if not len(others):
+            return
+        if len(others) > batch:
+            cutoff = np.partition(areas, len(areas) - batch)[-batch]
+            keep = areas >= cutoff
+            others, areas = others[keep], areas[keep]
+        order = np.lexsort((others, -areas))[:batch]
+        for j, area in zip(others[order].tolist(), areas[order].tolist()):
+            yield area, j
+        last_area, last_j = area, j
+
+
+def gen_inside_areas(coords):
+    """Generate (area, i, j) for rectangles inside the walls, largest first.
+
+    Branch and bound: a heap holds each unexpanded vertex under the
+    biggest area it could reach, and each expanded vertex under the
+    area of its cursor's next partner. Popping the heap always gives
+    the largest pair not yet tried, so a rectangle that passes the
+    inside test is the next largest answer.
+    """
+    edges = build_edges(coords)
+    xs, ys, prefix = build_inside_grid(coords)
+    # Lists bisect much faster than arrays for one point at a time.
+    grid = (xs.tolist(), ys.tolist(), prefix)
+    px, py = get_vertex_arrays(coords)
+    bounds = get_area_bounds(px, py)
+    # (-area bound, vertex, partner); partner -1 means the vertex
+    # hasn't been expanded yet.
+    heap = [(-int(bound), i, -1) for i, bound in enumerate(bounds)]
+    heapq.heapify(heap)
+    # Expansion order; a pair belongs to whichever vertex came first.
+    rank = np.full(len(coords), len(coords))
+    cursors = {}
+    while heap:
+        neg_area, i, j = heapq.heappop(heap)
+        inside = False
+        if j < 0:
+            rank[i] = len(cursors)
+            cursors[i] = gen_partners(px, py, rank, i)
+        else:
+            inside = is_rect_inside(grid, edges, *coords[i], *coords[j])
+        partner = next(cursors[i], None)
+        if partner is not None:
+            area, k = partner
+            heapq.heappush(heap, (-area, i, k))
+        if inside:
+            yield -neg_area, min(i, j), max(i, j)
+
+
+def get_max_area2(coords):
+    """Get the largest rectangle inside the walls."""
+    return next(gen_inside_areas(coords), (0,))[0]
+
+
+def get_top_areas2(coords, k):
+    """Get the k largest (area, i, j) inside the walls, largest first."""
+    return list(itertools.islice(gen_inside_areas(coords), k))
+
+
 def main():
     """Run the main body of the script."""
     # lines = list(get_input("p9-sample-input.txt"))
     lines = list(get_input("p9-full-input.txt"))
     coords = parse_lines(lines)
-    areas = get_areas(coords)
     print("Part 1:")
-    largest_rect = sorted(areas, reverse=True)[0]
+    largest_rect = get_max_area(coords)
     print(f"\t{largest_rect=}")
     print("Part 2:")
-    areas = get_areas2(coords)
-    largest_rect = sorted(areas, reverse=True)[0]
+    largest_rect = get_max_area2(coords)
     print(f"\t{largest_rect=}")
 
 